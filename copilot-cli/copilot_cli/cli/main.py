@@ -1,13 +1,16 @@
 """Main CLI entry point for the Data Engineering Copilot."""
 
+import json
 import os
 import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 import typer
 from rich.console import Console
 from rich.panel import Panel
+from rich.table import Table
 
 from copilot_cli import __version__
 
@@ -52,40 +55,296 @@ def main(
         console.print("[yellow]Debug mode enabled[/yellow]")
 
 
-@app.command()
-def sql(
-    optimize: str = typer.Argument(..., help="SQL file to optimize"),
+sql_app = typer.Typer(help="Optimize and verify SQL queries", rich_markup_mode="rich")
+app.add_typer(sql_app, name="sql")
+
+
+@sql_app.command("optimize")
+def sql_optimize(
+    query_file: str = typer.Argument(..., help="SQL file to optimize"),
     output: str = typer.Option("rich", "--output", "-o", help="Output format (rich/json)"),
 ) -> None:
     """Optimize SQL queries using AI analysis."""
-    console.print(f"[green]SQL optimization for: {optimize}[/green]")
+    console.print(f"[green]SQL optimization for: {query_file}[/green]")
     # TODO: Implement SQL optimization
     console.print("[yellow]SQL optimization feature coming soon![/yellow]")
 
 
-@app.command()
-def dag(
-    explain: str = typer.Argument(..., help="Airflow DAG file to explain"),
+@sql_app.command("verify")
+def sql_verify(
+    original: str = typer.Argument(..., help="Original SQL file"),
+    optimized: str = typer.Argument(..., help="Optimized SQL file or saved LLM response"),
+    schema_dir: str = typer.Option(
+        "data_pipeline/schemas", "--schema-dir", help="Directory of JSON Schemas to load as tables"
+    ),
+    table: List[str] = typer.Option(
+        [], "--table", "-t", help="Extra table as name=schema.json (repeatable)"
+    ),
+    setup_sql: Optional[str] = typer.Option(
+        None, "--setup", help="SQL script run after loading (views, derived tables)"
+    ),
+    rows: int = typer.Option(1000, "--rows", "-r", help="Synthetic rows per table"),
+    runs: int = typer.Option(5, "--runs", help="Timed runs per query"),
+    seed: int = typer.Option(42, "--seed", help="Random seed for synthetic data"),
+    output: str = typer.Option("rich", "--output", "-o", help="Output format (rich/json)"),
+) -> None:
+    """Check an optimized query returns the same rows, faster, on synthetic data."""
+    from copilot_cli.data.sql_verify import (
+        build_database,
+        extract_optimized_query,
+        verify_rewrite,
+    )
+    from copilot_cli.data.synthetic import load_tables, table_name_for
+    from copilot_cli.utils.file_utils import list_files_in_directory, read_file
+
+    schema_paths = {
+        table_name_for(path): path
+        for path in sorted(list_files_in_directory(schema_dir, [".json"]))
+    }
+    for entry in table:
+        name, sep, path = entry.partition("=")
+        if not sep:
+            console.print(f"[red]Invalid --table '{entry}', expected name=schema.json[/red]")
+            raise typer.Exit(1)
+        schema_paths[name] = path
+
+    tables = load_tables(schema_paths)
+    conn = build_database(
+        tables, rows, seed=seed, setup_sql=read_file(setup_sql) if setup_sql else None
+    )
+    report = verify_rewrite(
+        conn, read_file(original), extract_optimized_query(read_file(optimized)), runs
+    )
+
+    if output == "json":
+        console.print_json(json.dumps(report))
+    else:
+        _print_verification(report)
+
+    if not report["equivalent"]:
+        raise typer.Exit(1)
+
+
+def _print_verification(report: Dict[str, Any]) -> None:
+    """Render a SQL verification report to the console."""
+    for label, error in report["errors"].items():
+        console.print(f"[red]{label} query failed: {error}[/red]")
+    if report["errors"]:
+        return
+
+    timings = Table(title=f"Timings over {report['runs']} runs (ms)")
+    timings.add_column("Query")
+    timings.add_column("Rows", justify="right")
+    for stat in ("min_ms", "median_ms", "p95_ms", "max_ms"):
+        timings.add_column(stat[:-3], justify="right")
+    for label in ("original", "optimized"):
+        stats = report[label]["timings"]
+        timings.add_row(
+            label,
+            str(report[label]["rows"]),
+            *(f"{stats[s]:.3f}" for s in ("min_ms", "median_ms", "p95_ms", "max_ms")),
+        )
+    console.print(timings)
+
+    if report["equivalent"]:
+        console.print("[green]Results are equivalent[/green]")
+    elif report["same_rows_any_order"]:
+        console.print("[yellow]Same rows but in a different order[/yellow]")
+    else:
+        console.print("[red]Results differ[/red]")
+    console.print(f"[blue]Median speedup: {report['speedup']:.2f}x[/blue]")
+
+    if report["plan_diff"]:
+        console.print(Panel("\n".join(report["plan_diff"]), title="EXPLAIN QUERY PLAN diff"))
+    else:
+        console.print("[blue]Query plans are identical[/blue]")
+
+
+dag_app = typer.Typer(help="Explain and simulate Airflow DAGs", rich_markup_mode="rich")
+app.add_typer(dag_app, name="dag")
+
+
+@dag_app.command("explain")
+def dag_explain(
+    dag_file: str = typer.Argument(..., help="Airflow DAG file to explain"),
     output: str = typer.Option("rich", "--output", "-o", help="Output format (rich/json)"),
 ) -> None:
     """Explain Airflow DAGs using AI analysis."""
-    console.print(f"[green]DAG explanation for: {explain}[/green]")
+    console.print(f"[green]DAG explanation for: {dag_file}[/green]")
     # TODO: Implement DAG explanation
     console.print("[yellow]DAG explanation feature coming soon![/yellow]")
 
 
-@app.command()
-def dbt(
-    generate: str = typer.Argument(..., help="Schema file to generate dbt model from"),
+@dag_app.command("simulate")
+def dag_simulate(
+    dag_file: str = typer.Argument(..., help="Airflow DAG file to simulate"),
+    history: Optional[str] = typer.Option(
+        None, "--history", "-H", help="Task durations and retries (CSV or JSON)"
+    ),
+    slots: Optional[int] = typer.Option(None, "--slots", "-s", help="Pool slot limit"),
+    stat: str = typer.Option("mean", "--stat", help="Duration statistic (mean/median/p95)"),
+    default_duration: float = typer.Option(
+        60.0, "--default-duration", help="Seconds assumed for tasks without history"
+    ),
+    output: str = typer.Option("rich", "--output", "-o", help="Output format (rich/json)"),
+) -> None:
+    """Compute critical path, parallelism and expected run time of a DAG."""
+    from copilot_cli.dag.graph import build_task_graph
+    from copilot_cli.dag.simulator import load_task_stats, simulate
+
+    if stat not in ("mean", "median", "p95"):
+        console.print(f"[red]Unsupported statistic '{stat}', expected mean, median or p95[/red]")
+        raise typer.Exit(1)
+
+    graph = build_task_graph(dag_file)
+    if not graph.tasks:
+        console.print(f"[yellow]No tasks found in {dag_file}[/yellow]")
+        raise typer.Exit()
+
+    stats = load_task_stats(history) if history else {}
+    report = simulate(graph, stats, slots=slots, stat=stat, default_duration=default_duration)
+
+    if output == "json":
+        console.print_json(json.dumps(report))
+    else:
+        _print_simulation(report)
+
+
+def _format_seconds(seconds: float) -> str:
+    """Format seconds as ``1h 02m 03s``."""
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m {secs:02d}s" if hours else f"{minutes}m {secs:02d}s"
+
+
+def _print_simulation(report: Dict[str, Any]) -> None:
+    """Render a DAG simulation report to the console."""
+    if report["missing_history"]:
+        console.print(
+            f"[yellow]No history for {len(report['missing_history'])} tasks; "
+            f"assumed default duration: {', '.join(report['missing_history'])}[/yellow]"
+        )
+
+    summary = Table(title=f"DAG {report['dag_id']} ({report['schedule']})", show_header=False)
+    summary.add_row("Critical path", _format_seconds(report["critical_path_seconds"]))
+    summary.add_row("Max parallel width", str(report["max_parallel_width"]))
+    slots = report["slots"] or "unlimited"
+    summary.add_row(f"Expected wall-clock ({slots} slots)", _format_seconds(report["wall_clock_seconds"]))
+    if report["budget_seconds"]:
+        verdict = "[green]fits[/green]" if report["fits_schedule"] else "[red]overruns[/red]"
+        summary.add_row("Schedule budget", f"{_format_seconds(report['budget_seconds'])} ({verdict})")
+    console.print(summary)
+
+    path = Table(title="Critical path")
+    path.add_column("Task")
+    path.add_column("Expected", justify="right")
+    for task_id in report["critical_path"]:
+        path.add_row(task_id, _format_seconds(report["durations"][task_id]))
+    console.print(path)
+
+    for chain in report["serial_chains"]:
+        console.print(f"[yellow]Serialized chain:[/yellow] {' >> '.join(chain)}")
+
+    if report["parallelization_candidates"]:
+        candidates = Table(title="Parallelizing these tasks would shorten the run")
+        candidates.add_column("Task")
+        candidates.add_column("Saving if split in two", justify="right")
+        for candidate in report["parallelization_candidates"][:10]:
+            candidates.add_row(candidate["task_id"], _format_seconds(candidate["saving"]))
+        console.print(candidates)
+
+
+dbt_app = typer.Typer(help="Generate and review dbt models", rich_markup_mode="rich")
+app.add_typer(dbt_app, name="dbt")
+
+
+@dbt_app.command("generate")
+def dbt_generate(
+    schema_file: str = typer.Option(..., "--schema", help="Schema file to generate dbt model from"),
     save: bool = typer.Option(False, "--save", "-s", help="Save generated files"),
     output: str = typer.Option("rich", "--output", "-o", help="Output format (rich/json)"),
 ) -> None:
     """Generate dbt models from schema files."""
-    console.print(f"[green]dbt generation for: {generate}[/green]")
+    console.print(f"[green]dbt generation for: {schema_file}[/green]")
     # TODO: Implement dbt generation
     console.print("[yellow]dbt generation feature coming soon![/yellow]")
 
 
+@dbt_app.command("review")
+def dbt_review(
+    models_dir: str = typer.Argument("data_pipeline/dbt/models", help="dbt models directory"),
+    workers: int = typer.Option(4, "--workers", "-w", help="Concurrent generations per level"),
+    model: Optional[str] = typer.Option(None, "--model", "-m", help="Model override"),
+    var: List[str] = typer.Option([], "--var", help="dbt var as name=value (repeatable)"),
+    schema_prefix: Optional[str] = typer.Option(
+        None, "--target-schema", help="Schema prefix for rendered ref() calls"
+    ),
+    cache_dir: Optional[str] = typer.Option(None, "--cache-dir", help="Compiled SQL cache directory"),
+    compile_only: bool = typer.Option(False, "--compile-only", help="Only render models to SQL"),
+    output: str = typer.Option("rich", "--output", "-o", help="Output format (rich/json/ndjson)"),
+    output_file: Optional[str] = typer.Option(
+        None, "--output-file", help="Append an NDJSON record per reviewed model to this file"
+    ),
+    save_dir: Optional[str] = typer.Option(
+        None, "--save-dir", help="Save each review as a Markdown file under this directory"
+    ),
+) -> None:
+    """Compile a dbt project locally and review its models in dependency order."""
+    from copilot_cli.dbt.project import DbtProject
+
+    variables = {}
+    for entry in var:
+        name, sep, value = entry.partition("=")
+        if not sep:
+            console.print(f"[red]Invalid --var '{entry}', expected name=value[/red]")
+            raise typer.Exit(1)
+        variables[name] = value
+
+    try:
+        project = DbtProject(models_dir, variables, schema_prefix, cache_dir)
+        levels = project.levels()
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+
+    if not project.models:
+        console.print(f"[yellow]No dbt models found in {models_dir}[/yellow]")
+        raise typer.Exit()
+
+    summary = f"[green]{len(project.models)} models in {len(levels)} dependency levels[/green]"
+    if compile_only:
+        console.print(summary)
+        compiled = project.compile()
+        if output != "rich":
+            console.print_json(json.dumps(compiled))
+        else:
+            for name, sql in compiled.items():
+                console.print(Panel(sql, title=name))
+        for name, dbt_model in project.models.items():
+            if dbt_model.unrendered:
+                console.print(
+                    f"[yellow]{name}: could not render {', '.join(dbt_model.unrendered)}[/yellow]"
+                )
+        console.print(
+            f"[blue]Compiled cache: {project.cache.hits} hits, {project.cache.misses} misses[/blue]"
+        )
+        return
+
+    from copilot_cli.llm.analysis import AnalysisResult
+    from copilot_cli.llm.ollama_client import OllamaClient
+
+    with _result_sink("dbt review", output, output_file, save_dir, models_dir) as sink:
+        console.print(summary)
+
+        def report(result: AnalysisResult) -> None:
+            sink.emit(result)
+            _print_result(result, output)
+
+        results = project.review(OllamaClient(), workers=workers, model=model, on_result=report)
+    if output == "json":
+        console.print_json(json.dumps([r.to_dict() for r in results]))
+
+
 @app.command()
 def schema(
     compare: str = typer.Argument(..., help="Expected schema file"),
@@ -98,6 +357,205 @@ def schema(
     console.print("[yellow]Schema comparison feature coming soon![/yellow]")
 
 
+def _result_sink(
+    command: str,
+    output: str,
+    output_file: Optional[str],
+    save_dir: Optional[str],
+    root: str,
+) -> Any:
+    """Create the streaming sink for a command's results.
+
+    Records go to ``output_file`` when given, otherwise to stdout with
+    ``--output ndjson``.
+    """
+    from copilot_cli.utils.sinks import ResultSink
+
+    target = output_file or ("-" if output == "ndjson" else None)
+    return ResultSink(command, target, save_dir, root)
+
+
+def _print_result(result: Any, output: str) -> None:
+    """Show a completed analysis on the console.
+
+    Responses are shown only with rich output; failures are always reported
+    (on stderr when NDJSON records own stdout).
+    """
+    if not result.ok:
+        console.print(f"[red]Failed {result.path}: {result.error}[/red]")
+    elif output == "rich":
+        console.print(Panel(result.response, title=f"{result.analysis}: {result.path}"))
+
+
+@app.command()
+def batch(
+    directory: str = typer.Argument(..., help="Directory of SQL, DAG and schema files"),
+    workers: int = typer.Option(4, "--workers", "-w", help="Concurrent generations"),
+    model: Optional[str] = typer.Option(None, "--model", "-m", help="Model override"),
+    timeout: Optional[float] = typer.Option(None, "--timeout", help="Per-request deadline in seconds"),
+    hedge: Optional[float] = typer.Option(
+        None, "--hedge-percentile", help="Hedge with the fallback model past this latency percentile"
+    ),
+    output: str = typer.Option("rich", "--output", "-o", help="Output format (rich/json/ndjson)"),
+    output_file: Optional[str] = typer.Option(
+        None, "--output-file", help="Append an NDJSON record per artifact to this file"
+    ),
+    save_dir: Optional[str] = typer.Option(
+        None, "--save-dir", help="Save each response as a Markdown file under this directory"
+    ),
+) -> None:
+    """Analyze every supported artifact in a directory."""
+    from copilot_cli.llm.analysis import SUPPORTED_EXTENSIONS, analyze_files
+    from copilot_cli.llm.ollama_client import OllamaClient
+    from copilot_cli.utils.file_utils import list_files_in_directory
+
+    with _result_sink("batch", output, output_file, save_dir, directory) as sink:
+        files = sorted(list_files_in_directory(directory, SUPPORTED_EXTENSIONS))
+        if not files:
+            console.print(f"[yellow]No supported files found in {directory}[/yellow]")
+            raise typer.Exit()
+
+        console.print(f"[green]Analyzing {len(files)} files with {workers} workers[/green]")
+        client = OllamaClient(timeout=timeout, hedge_percentile=hedge)
+        results = []
+        for result in analyze_files(client, files, workers=workers, model=model):
+            sink.emit(result)
+            _print_result(result, output)
+            if output == "json":
+                results.append(result.to_dict())
+
+        if output == "json":
+            console.print_json(json.dumps(results))
+        console.print(
+            f"[blue]Coalesced {client.coalesced} duplicate generations[/blue]"
+        )
+
+
+@app.command()
+def watch(
+    directory: str = typer.Argument(".", help="Directory to watch"),
+    debounce: float = typer.Option(0.5, "--debounce", "-d", help="Seconds to wait after the last save"),
+    workers: int = typer.Option(2, "--workers", "-w", help="Concurrent generations"),
+    model: Optional[str] = typer.Option(None, "--model", "-m", help="Model override"),
+    poll: bool = typer.Option(False, "--poll", help="Force the polling backend"),
+    timeout: Optional[float] = typer.Option(None, "--timeout", help="Per-request deadline in seconds"),
+    hedge: Optional[float] = typer.Option(
+        None, "--hedge-percentile", help="Hedge with the fallback model past this latency percentile"
+    ),
+    output: str = typer.Option("rich", "--output", "-o", help="Output format (rich/ndjson)"),
+    output_file: Optional[str] = typer.Option(
+        None, "--output-file", help="Append an NDJSON record per analysis to this file"
+    ),
+    save_dir: Optional[str] = typer.Option(
+        None, "--save-dir", help="Save each response as a Markdown file under this directory"
+    ),
+) -> None:
+    """Watch a directory and re-analyze SQL, DAG and schema files on save."""
+    from copilot_cli.llm.analysis import (
+        SUPPORTED_EXTENSIONS,
+        AnalysisResult,
+        WatchSession,
+    )
+    from copilot_cli.llm.ollama_client import OllamaClient
+    from copilot_cli.utils.watcher import DirectoryWatcher
+
+    with _result_sink("watch", output, output_file, save_dir, directory) as sink:
+
+        def report(result: AnalysisResult) -> None:
+            sink.emit(result)
+            _print_result(result, output)
+
+        client = OllamaClient(timeout=timeout, hedge_percentile=hedge)
+        session = WatchSession(client, report, workers=workers, model=model)
+        watcher = DirectoryWatcher(
+            directory,
+            session.submit,
+            extensions=SUPPORTED_EXTENSIONS,
+            debounce=debounce,
+            use_polling=poll,
+            # Never re-analyze our own output
+            exclude=[p for p in (output_file, save_dir) if p],
+        )
+
+        watcher.start()
+        console.print(
+            f"[green]Watching {directory} ({watcher.backend}). Press Ctrl+C to stop.[/green]"
+        )
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            console.print("[yellow]Stopping watch...[/yellow]")
+        finally:
+            watcher.stop()
+            session.close()
+
+
+data_app = typer.Typer(help="Synthetic data for exercising the pipeline", rich_markup_mode="rich")
+app.add_typer(data_app, name="data")
+
+
+@data_app.command("synth")
+def data_synth(
+    schema_dir: str = typer.Option(
+        "data_pipeline/schemas", "--schema-dir", help="Directory of JSON Schemas"
+    ),
+    rows: int = typer.Option(100_000, "--rows", "-r", help="Rows per table"),
+    table_rows: List[str] = typer.Option(
+        [], "--table-rows", help="Per-table row count as name=N (repeatable)"
+    ),
+    fmt: str = typer.Option("csv", "--format", "-f", help="Output format (csv/ndjson)"),
+    output_dir: str = typer.Option("synthetic_data", "--output-dir", "-d", help="Output directory"),
+    chunk_size: int = typer.Option(100_000, "--chunk-size", help="Rows per generated chunk"),
+    workers: Optional[int] = typer.Option(None, "--workers", "-w", help="Worker processes"),
+    seed: int = typer.Option(42, "--seed", help="Random seed"),
+) -> None:
+    """Generate schema-conformant synthetic rows with shared foreign keys."""
+    from copilot_cli.data.synthetic import load_tables, table_name_for, write_table
+    from copilot_cli.utils.file_utils import list_files_in_directory
+
+    if fmt not in ("csv", "ndjson"):
+        console.print(f"[red]Unsupported format '{fmt}', expected csv or ndjson[/red]")
+        raise typer.Exit(1)
+
+    tables = load_tables(
+        {
+            table_name_for(path): path
+            for path in sorted(list_files_in_directory(schema_dir, [".json"]))
+        }
+    )
+    if not tables:
+        console.print(f"[yellow]No schemas found in {schema_dir}[/yellow]")
+        raise typer.Exit()
+
+    row_counts = {name: rows for name in tables}
+    for entry in table_rows:
+        name, sep, count = entry.partition("=")
+        if not sep or name not in tables or not count.isdigit():
+            console.print(f"[red]Invalid --table-rows '{entry}', expected name=N[/red]")
+            raise typer.Exit(1)
+        row_counts[name] = int(count)
+
+    for name, table in tables.items():
+        path = str(Path(output_dir) / f"{name}.{fmt}")
+        started = time.perf_counter()
+        written = write_table(
+            table,
+            row_counts[name],
+            path,
+            fmt=fmt,
+            seed=seed,
+            row_counts=row_counts,
+            chunk_size=chunk_size,
+            workers=workers,
+        )
+        elapsed = time.perf_counter() - started
+        console.print(
+            f"[green]Wrote {written:,} rows to {path} in {elapsed:.1f}s "
+            f"({written / max(elapsed, 1e-9):,.0f} rows/s)[/green]"
+        )
+
+
 @app.command()
 def setup() -> None:
     """Setup the copilot environment and dependencies."""
@@ -0,0 +1 @@
+"""Airflow DAG analysis for the Data Engineering Copilot."""
@@ -0,0 +1,303 @@
+"""Static extraction of Airflow task graphs from DAG files."""
+
+import ast
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from copilot_cli.utils.file_utils import parse_python_file
+
+# Cron presets and simple cron expressions mapped to their interval in seconds
+SCHEDULE_PRESETS = {
+    "@hourly": 3600,
+    "@daily": 86400,
+    "@midnight": 86400,
+    "@weekly": 604800,
+}
+
+
+class TaskNode:
+    """A task found in a DAG file."""
+
+    def __init__(
+        self,
+        task_id: str,
+        variable: Optional[str] = None,
+        operator: Optional[str] = None,
+        retries: int = 0,
+        retry_delay: float = 0.0,
+    ):
+        """Initialize the task.
+
+        Args:
+            task_id: Airflow task_id
+            variable: Python variable the task is bound to
+            operator: Operator class name
+            retries: Number of retries
+            retry_delay: Seconds between retries
+        """
+        self.task_id = task_id
+        self.variable = variable
+        self.operator = operator
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+
+class TaskGraph:
+    """Tasks and dependency edges of a DAG, built without importing Airflow."""
+
+    def __init__(self, dag_id: Optional[str] = None, schedule: Optional[str] = None):
+        """Initialize an empty graph.
+
+        Args:
+            dag_id: DAG identifier
+            schedule: Schedule interval as written in the DAG file
+        """
+        self.dag_id = dag_id
+        self.schedule = schedule
+        self.tasks: Dict[str, TaskNode] = {}
+        self.upstream: Dict[str, Set[str]] = {}
+        self.downstream: Dict[str, Set[str]] = {}
+
+    def add_task(self, task: TaskNode) -> None:
+        """Register a task."""
+        self.tasks[task.task_id] = task
+        self.upstream.setdefault(task.task_id, set())
+        self.downstream.setdefault(task.task_id, set())
+
+    def add_edge(self, upstream: str, downstream: str) -> None:
+        """Register a dependency ``upstream >> downstream``."""
+        self.downstream[upstream].add(downstream)
+        self.upstream[downstream].add(upstream)
+
+    def topological_order(self) -> List[str]:
+        """Return task ids in dependency order.
+
+        Raises:
+            ValueError: If the graph contains a cycle
+        """
+        remaining = {t: len(self.upstream[t]) for t in self.tasks}
+        ready = sorted(t for t, n in remaining.items() if n == 0)
+        order = []
+        while ready:
+            task_id = ready.pop(0)
+            order.append(task_id)
+            for child in sorted(self.downstream[task_id]):
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    ready.append(child)
+        if len(order) != len(self.tasks):
+            raise ValueError("DAG contains a dependency cycle")
+        return order
+
+    @property
+    def schedule_seconds(self) -> Optional[int]:
+        """Interval between scheduled runs in seconds, if it can be inferred."""
+        if not self.schedule:
+            return None
+        if self.schedule in SCHEDULE_PRESETS:
+            return SCHEDULE_PRESETS[self.schedule]
+        fields = self.schedule.split()
+        if len(fields) == 5 and fields[0].isdigit():
+            if fields[1:] == ["*", "*", "*", "*"]:
+                return 3600
+            if fields[1].isdigit() and fields[2:] == ["*", "*", "*"]:
+                return 86400
+        return None
+
+
+def _literal(node: ast.AST) -> Any:
+    """Evaluate literals and ``timedelta(...)`` calls; None if not static."""
+    if isinstance(node, ast.Call) and _call_name(node) == "timedelta":
+        try:
+            kwargs = {
+                kw.arg: ast.literal_eval(kw.value) for kw in node.keywords if kw.arg
+            }
+            args = [ast.literal_eval(a) for a in node.args]
+            return timedelta(*args, **kwargs)
+        except (ValueError, TypeError):
+            return None
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError):
+        return None
+
+
+def _call_name(node: ast.Call) -> Optional[str]:
+    """Return the called name (``PythonOperator``, ``timedelta``, ...)."""
+    if isinstance(node.func, ast.Name):
+        return node.func.id
+    if isinstance(node.func, ast.Attribute):
+        return node.func.attr
+    return None
+
+
+def _static_dict(node: ast.AST) -> Dict[str, Any]:
+    """Evaluate the statically known entries of a dict literal."""
+    if not isinstance(node, ast.Dict):
+        return {}
+    values = {}
+    for key, value in zip(node.keys, node.values):
+        if isinstance(key, ast.Constant) and isinstance(key.value, str):
+            values[key.value] = _literal(value)
+    return values
+
+
+def _seconds(value: Any) -> float:
+    """Convert a retry_delay value to seconds."""
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, (int, float)):
+        return float(value)
+    return 0.0
+
+
+class _DagVisitor(ast.NodeVisitor):
+    """Collect DAG settings, tasks and dependencies from a module."""
+
+    def __init__(self) -> None:
+        self.graph = TaskGraph()
+        self.dicts: Dict[str, Dict[str, Any]] = {}
+        self.variables: Dict[str, str] = {}
+        self.task_calls: List[Tuple[Optional[str], ast.Call]] = []
+        self.dependencies: List[ast.AST] = []
+        self.default_args: Dict[str, Any] = {}
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        target = node.targets[0].id if isinstance(node.targets[0], ast.Name) else None
+        if isinstance(node.value, ast.Dict) and target:
+            self.dicts[target] = _static_dict(node.value)
+        elif isinstance(node.value, ast.Call):
+            self._visit_call(node.value, target)
+        self.generic_visit(node)
+
+    def visit_With(self, node: ast.With) -> None:
+        for item in node.items:
+            if isinstance(item.context_expr, ast.Call):
+                self._visit_call(item.context_expr, None)
+        self.generic_visit(node)
+
+    def visit_Expr(self, node: ast.Expr) -> None:
+        if isinstance(node.value, (ast.BinOp, ast.Call)):
+            self.dependencies.append(node.value)
+        self.generic_visit(node)
+
+    def _visit_call(self, call: ast.Call, target: Optional[str]) -> None:
+        keywords = {kw.arg: kw.value for kw in call.keywords if kw.arg}
+        if _call_name(call) == "DAG":
+            if call.args:
+                self.graph.dag_id = _literal(call.args[0])
+            if "dag_id" in keywords:
+                self.graph.dag_id = _literal(keywords["dag_id"])
+            for key in ("schedule_interval", "schedule"):
+                if key in keywords and isinstance(_literal(keywords[key]), str):
+                    self.graph.schedule = _literal(keywords[key])
+            args = keywords.get("default_args")
+            if isinstance(args, ast.Name):
+                self.default_args = self.dicts.get(args.id, {})
+            elif args is not None:
+                self.default_args = _static_dict(args)
+        elif "task_id" in keywords:
+            self.task_calls.append((target, call))
+
+    def build(self) -> TaskGraph:
+        """Create tasks and edges from what was collected."""
+        for target, call in self.task_calls:
+            keywords = {kw.arg: kw.value for kw in call.keywords if kw.arg}
+            task_id = _literal(keywords["task_id"])
+            if not isinstance(task_id, str):
+                continue
+            retries = _literal(keywords["retries"]) if "retries" in keywords else None
+            delay = (
+                _literal(keywords["retry_delay"]) if "retry_delay" in keywords else None
+            )
+            self.graph.add_task(
+                TaskNode(
+                    task_id,
+                    variable=target,
+                    operator=_call_name(call),
+                    retries=int(
+                        retries
+                        if retries is not None
+                        else self.default_args.get("retries") or 0
+                    ),
+                    retry_delay=_seconds(
+                        delay
+                        if delay is not None
+                        else self.default_args.get("retry_delay")
+                    ),
+                )
+            )
+            if target:
+                self.variables[target] = task_id
+
+        for node in self.dependencies:
+            self._resolve(node)
+        return self.graph
+
+    def _tasks(self, node: ast.AST) -> List[str]:
+        """Resolve an operand of ``>>``/``<<`` to task ids."""
+        if isinstance(node, ast.Name) and node.id in self.variables:
+            return [self.variables[node.id]]
+        if isinstance(node, (ast.List, ast.Tuple)):
+            return [t for element in node.elts for t in self._tasks(element)]
+        if isinstance(node, (ast.BinOp, ast.Call)):
+            return self._resolve(node)
+        return []
+
+    def _resolve(self, node: ast.AST) -> List[str]:
+        """Add edges for a dependency expression, returning its result tasks."""
+        if isinstance(node, ast.BinOp) and isinstance(
+            node.op, (ast.RShift, ast.LShift)
+        ):
+            left = self._tasks(node.left)
+            right = self._tasks(node.right)
+            upstream, downstream = (
+                (left, right) if isinstance(node.op, ast.RShift) else (right, left)
+            )
+            for u in upstream:
+                for d in downstream:
+                    self.graph.add_edge(u, d)
+            return right
+
+        if isinstance(node, ast.Call):
+            name = _call_name(node)
+            if name == "chain":
+                groups = [self._tasks(a) for a in node.args]
+                for upstream, downstream in zip(groups, groups[1:]):
+                    for u in upstream:
+                        for d in downstream:
+                            self.graph.add_edge(u, d)
+                return groups[-1] if groups else []
+            if name in ("set_downstream", "set_upstream") and isinstance(
+                node.func, ast.Attribute
+            ):
+                owner = self._tasks(node.func.value)
+                others = [t for a in node.args for t in self._tasks(a)]
+                for o in owner:
+                    for t in others:
+                        if name == "set_downstream":
+                            self.graph.add_edge(o, t)
+                        else:
+                            self.graph.add_edge(t, o)
+                return owner
+        return []
+
+
+def build_task_graph(file_path: str) -> TaskGraph:
+    """Statically build the task graph of an Airflow DAG file.
+
+    The file is parsed, never imported, so Airflow does not need to be
+    installed. Tasks are operator calls with a literal ``task_id``;
+    dependencies come from ``>>``/``<<``, ``chain()`` and
+    ``set_upstream``/``set_downstream``. Retry settings fall back to the DAG's
+    ``default_args``.
+
+    Args:
+        file_path: Path to the DAG file
+
+    Returns:
+        Task graph
+    """
+    visitor = _DagVisitor()
+    visitor.visit(ast.parse(parse_python_file(file_path), filename=file_path))
+    return visitor.build()
@@ -0,0 +1,407 @@
+"""Critical-path and slot-limited run-time simulation for task graphs."""
+
+import csv
+import heapq
+import json
+import statistics
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from copilot_cli.dag.graph import TaskGraph, TaskNode
+from copilot_cli.utils.file_utils import read_file
+
+FAILED_STATES = ("failed", "up_for_retry", "upstream_failed")
+
+
+class TaskStats:
+    """Historical run statistics for one task."""
+
+    def __init__(
+        self,
+        durations: List[float],
+        failure_rate: float = 0.0,
+        retries: Optional[int] = None,
+        retry_delay: Optional[float] = None,
+    ):
+        """Initialize the statistics.
+
+        Args:
+            durations: Observed successful attempt durations in seconds
+            failure_rate: Probability that a single attempt fails
+            retries: Retry override (defaults to the DAG's setting)
+            retry_delay: Retry delay override in seconds
+        """
+        self.durations = durations
+        self.failure_rate = failure_rate
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+    def duration(self, stat: str = "mean") -> float:
+        """Summarize attempt duration with ``mean``, ``median`` or ``p95``."""
+        if stat == "median":
+            return statistics.median(self.durations)
+        if stat == "p95":
+            ordered = sorted(self.durations)
+            return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+        return statistics.mean(self.durations)
+
+
+def _optional_float(value: Any) -> Optional[float]:
+    """Parse a float from a CSV/JSON value, treating blanks as missing."""
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def load_task_stats(file_path: str) -> Dict[str, TaskStats]:
+    """Load historical task durations from CSV or JSON.
+
+    CSV files have one row per task run with ``task_id`` and ``duration``
+    (seconds) columns, plus optional ``state``, ``failure_rate``, ``retries``
+    and ``retry_delay`` columns. Failure rates are derived from ``state`` when
+    present. JSON files map task ids to a duration, a list of durations, or an
+    object with the same keys as the CSV columns (``duration`` may be a list).
+
+    Args:
+        file_path: Path to the CSV or JSON file
+
+    Returns:
+        Statistics keyed by task id
+    """
+    samples: Dict[str, Dict[str, Any]] = {}
+
+    def entry(task_id: str) -> Dict[str, Any]:
+        return samples.setdefault(
+            task_id, {"durations": [], "runs": 0, "failures": 0, "overrides": {}}
+        )
+
+    if Path(file_path).suffix.lower() == ".json":
+        for task_id, value in json.loads(read_file(file_path)).items():
+            record = value if isinstance(value, dict) else {"duration": value}
+            durations = record.get("duration", [])
+            data = entry(task_id)
+            data["durations"].extend(
+                durations if isinstance(durations, list) else [durations]
+            )
+            data["overrides"] = record
+    else:
+        with open(file_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                data = entry(row["task_id"])
+                data["runs"] += 1
+                if (row.get("state") or "success").lower() in FAILED_STATES:
+                    data["failures"] += 1
+                    continue
+                if row.get("duration"):
+                    data["durations"].append(float(row["duration"]))
+                data["overrides"].update({k: v for k, v in row.items() if v})
+
+    stats = {}
+    for task_id, data in samples.items():
+        if not data["durations"]:
+            continue
+        overrides = data["overrides"]
+        failure_rate = _optional_float(overrides.get("failure_rate"))
+        if failure_rate is None and data["runs"]:
+            failure_rate = data["failures"] / data["runs"]
+        retries = _optional_float(overrides.get("retries"))
+        stats[task_id] = TaskStats(
+            [float(d) for d in data["durations"]],
+            failure_rate=min(max(failure_rate or 0.0, 0.0), 1.0),
+            retries=int(retries) if retries is not None else None,
+            retry_delay=_optional_float(overrides.get("retry_delay")),
+        )
+    return stats
+
+
+def expected_times(
+    graph: TaskGraph,
+    stats: Dict[str, TaskStats],
+    stat: str = "mean",
+    default_duration: float = 60.0,
+) -> Dict[str, Tuple[float, float]]:
+    """Compute each task's expected attempt time and retry waiting time.
+
+    With per-attempt failure probability ``p`` and ``r`` retries the expected
+    number of attempts is ``1 + p + ... + p^r``; every attempt after the first
+    also waits ``retry_delay``.
+
+    Args:
+        graph: Task graph
+        stats: Historical statistics keyed by task id
+        stat: Attempt duration statistic (mean, median or p95)
+        default_duration: Seconds assumed for tasks without history
+
+    Returns:
+        ``(attempt_seconds, delay_seconds)`` keyed by task id
+    """
+    times = {}
+    for task_id, task in graph.tasks.items():
+        task_stats = stats.get(task_id)
+        if task_stats is None:
+            times[task_id] = (default_duration, 0.0)
+            continue
+        retries = task_stats.retries if task_stats.retries is not None else task.retries
+        delay = (
+            task_stats.retry_delay
+            if task_stats.retry_delay is not None
+            else task.retry_delay
+        )
+        p = task_stats.failure_rate
+        attempts = sum(p**k for k in range(retries + 1))
+        times[task_id] = (task_stats.duration(stat) * attempts, delay * (attempts - 1))
+    return times
+
+
+def expected_durations(
+    graph: TaskGraph,
+    stats: Dict[str, TaskStats],
+    stat: str = "mean",
+    default_duration: float = 60.0,
+) -> Dict[str, float]:
+    """Compute each task's expected run time including retries.
+
+    Args:
+        graph: Task graph
+        stats: Historical statistics keyed by task id
+        stat: Attempt duration statistic (mean, median or p95)
+        default_duration: Seconds assumed for tasks without history
+
+    Returns:
+        Expected seconds keyed by task id
+    """
+    times = expected_times(graph, stats, stat, default_duration)
+    return {task_id: attempt + delay for task_id, (attempt, delay) in times.items()}
+
+
+def critical_path(
+    graph: TaskGraph, durations: Dict[str, float]
+) -> Tuple[float, List[str], Dict[str, float]]:
+    """Find the longest dependency chain.
+
+    Args:
+        graph: Task graph
+        durations: Expected seconds per task
+
+    Returns:
+        Path length, task ids on the path, and each task's earliest start
+    """
+    order = graph.topological_order()
+    start: Dict[str, float] = {}
+    via: Dict[str, Optional[str]] = {}
+    for task_id in order:
+        parents = graph.upstream[task_id]
+        best = max(parents, key=lambda p: start[p] + durations[p], default=None)
+        via[task_id] = best
+        start[task_id] = start[best] + durations[best] if best else 0.0
+
+    if not order:
+        return 0.0, [], start
+    end = max(order, key=lambda t: start[t] + durations[t])
+    path = [end]
+    parent = via[end]
+    while parent is not None:
+        path.append(parent)
+        parent = via[parent]
+    path.reverse()
+    return start[end] + durations[end], path, start
+
+
+def max_parallel_width(
+    graph: TaskGraph, durations: Dict[str, float], start: Dict[str, float]
+) -> int:
+    """Peak number of tasks running at once with unlimited slots.
+
+    Args:
+        graph: Task graph
+        durations: Expected seconds per task
+        start: Earliest start per task (from ``critical_path``)
+
+    Returns:
+        Maximum concurrency
+    """
+    events = []
+    for task_id in graph.tasks:
+        events.append((start[task_id], 1))
+        events.append((start[task_id] + durations[task_id], -1))
+    # Ends sort before starts at the same instant
+    events.sort(key=lambda e: (e[0], e[1]))
+    width = peak = 0
+    for _, delta in events:
+        width += delta
+        peak = max(peak, width)
+    return peak
+
+
+def _priorities(graph: TaskGraph, durations: Dict[str, float]) -> Dict[str, float]:
+    """Longest remaining path from each task to the end of the run."""
+    remaining: Dict[str, float] = {}
+    for task_id in reversed(graph.topological_order()):
+        tail = max((remaining[c] for c in graph.downstream[task_id]), default=0.0)
+        remaining[task_id] = durations[task_id] + tail
+    return remaining
+
+
+def simulate_run(
+    graph: TaskGraph, durations: Dict[str, float], slots: Optional[int] = None
+) -> float:
+    """Simulate a run with a limited number of pool slots.
+
+    Ready tasks are started in order of their remaining critical path, which
+    approximates Airflow's default downstream priority weighting.
+
+    Args:
+        graph: Task graph
+        durations: Expected seconds per task
+        slots: Concurrent task limit (unlimited when None)
+
+    Returns:
+        Expected wall-clock seconds
+    """
+    priority = _priorities(graph, durations)
+    waiting = {t: len(graph.upstream[t]) for t in graph.tasks}
+    ready = [(-priority[t], t) for t, n in waiting.items() if n == 0]
+    heapq.heapify(ready)
+    running: List[Tuple[float, str]] = []
+    now = 0.0
+    limit = slots if slots and slots > 0 else len(graph.tasks) or 1
+
+    while ready or running:
+        while ready and len(running) < limit:
+            _, task_id = heapq.heappop(ready)
+            heapq.heappush(running, (now + durations[task_id], task_id))
+        now, finished = heapq.heappop(running)
+        for child in graph.downstream[finished]:
+            waiting[child] -= 1
+            if waiting[child] == 0:
+                heapq.heappush(ready, (-priority[child], child))
+    return now
+
+
+def serial_chains(graph: TaskGraph, min_length: int = 3) -> List[List[str]]:
+    """Find linear runs of tasks that must execute one after another.
+
+    Args:
+        graph: Task graph
+        min_length: Shortest chain worth reporting
+
+    Returns:
+        Chains of task ids
+    """
+
+    def linked(a: str, b: str) -> bool:
+        return graph.downstream[a] == {b} and graph.upstream[b] == {a}
+
+    chains = []
+    for task_id in graph.topological_order():
+        parents = graph.upstream[task_id]
+        if len(parents) == 1 and linked(next(iter(parents)), task_id):
+            continue
+        chain = [task_id]
+        while len(graph.downstream[chain[-1]]) == 1:
+            child = next(iter(graph.downstream[chain[-1]]))
+            if not linked(chain[-1], child):
+                break
+            chain.append(child)
+        if len(chain) >= min_length:
+            chains.append(chain)
+    return chains
+
+
+def split_task(
+    graph: TaskGraph,
+    durations: Dict[str, float],
+    task_id: str,
+    shards: int,
+    delay: float = 0.0,
+) -> Tuple[TaskGraph, Dict[str, float]]:
+    """Replace a task with parallel shards that share its dependencies.
+
+    Args:
+        graph: Task graph
+        durations: Expected seconds per task
+        task_id: Task to split
+        shards: Number of shards, each taking ``1 / shards`` of the attempt time
+        delay: Expected retry-delay seconds included in the task's duration;
+            shards retry independently, so each one still waits all of it
+
+    Returns:
+        New graph and durations with the task replaced by its shards
+    """
+    shard_ids = [f"{task_id}[{i}]" for i in range(shards)]
+    trial = TaskGraph(graph.dag_id, graph.schedule)
+    trial_durations = {t: d for t, d in durations.items() if t != task_id}
+    for other, task in graph.tasks.items():
+        if other != task_id:
+            trial.add_task(task)
+    for shard_id in shard_ids:
+        trial.add_task(TaskNode(shard_id))
+        trial_durations[shard_id] = (durations[task_id] - delay) / shards + delay
+
+    def ids(name: str) -> List[str]:
+        return shard_ids if name == task_id else [name]
+
+    for upstream, children in graph.downstream.items():
+        for downstream in children:
+            for u in ids(upstream):
+                for d in ids(downstream):
+                    trial.add_edge(u, d)
+    return trial, trial_durations
+
+
+def simulate(
+    graph: TaskGraph,
+    stats: Dict[str, TaskStats],
+    slots: Optional[int] = None,
+    stat: str = "mean",
+    default_duration: float = 60.0,
+    split: int = 2,
+) -> Dict[str, Any]:
+    """Analyze where a DAG run spends its time.
+
+    Args:
+        graph: Task graph
+        stats: Historical statistics keyed by task id
+        slots: Pool slot limit (unlimited when None)
+        stat: Attempt duration statistic (mean, median or p95)
+        default_duration: Seconds assumed for tasks without history
+        split: Parallel shards each task is split into when estimating
+            parallelization gains
+
+    Returns:
+        Report with critical path, width, wall-clock and candidate tasks
+    """
+    times = expected_times(graph, stats, stat, default_duration)
+    durations = {
+        task_id: attempt + delay for task_id, (attempt, delay) in times.items()
+    }
+    length, path, start = critical_path(graph, durations)
+    wall_clock = simulate_run(graph, durations, slots)
+
+    candidates: List[Dict[str, Any]] = []
+    for task_id in graph.tasks:
+        # Each shard occupies its own slot, so busy pools gain less
+        trial, trial_durations = split_task(
+            graph, durations, task_id, split, delay=times[task_id][1]
+        )
+        saving = wall_clock - simulate_run(trial, trial_durations, slots)
+        if saving > 1e-9:
+            candidates.append({"task_id": task_id, "saving": saving})
+    candidates.sort(key=lambda c: c["saving"], reverse=True)
+
+    budget = graph.schedule_seconds
+    return {
+        "dag_id": graph.dag_id,
+        "schedule": graph.schedule,
+        "budget_seconds": budget,
+        "slots": slots,
+        "durations": durations,
+        "missing_history": sorted(t for t in graph.tasks if t not in stats),
+        "critical_path": path,
+        "critical_path_seconds": length,
+        "max_parallel_width": max_parallel_width(graph, durations, start),
+        "wall_clock_seconds": wall_clock,
+        "fits_schedule": wall_clock <= budget if budget else None,
+        "serial_chains": serial_chains(graph),
+        "parallelization_candidates": candidates,
+    }
@@ -0,0 +1 @@
+"""Synthetic data and SQL verification for the Data Engineering Copilot."""
@@ -0,0 +1,232 @@
+"""Empirical verification of optimized SQL against synthetic SQLite data."""
+
+import difflib
+import re
+import sqlite3
+import statistics
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import sqlparse
+from sqlparse import tokens as T
+
+from copilot_cli.data.synthetic import TableSpec, generate_rows
+
+_SQL_BLOCK_RE = re.compile(r"```(?:sql)?\s*\n(.*?)```", re.DOTALL | re.IGNORECASE)
+_OPTIMIZED_SECTION_RE = re.compile(
+    r"##\s*Optimized Query\s*\n(.*?)(?=\n##\s|\Z)", re.DOTALL | re.IGNORECASE
+)
+
+# Decimal places kept when comparing floating point results
+FLOAT_PRECISION = 9
+
+
+def extract_optimized_query(text: str) -> str:
+    """Extract the optimized SQL from an LLM response.
+
+    Looks for the ``## Optimized Query`` section requested by
+    SQL_OPTIMIZATION_PROMPT and returns its fenced SQL block. Text without
+    fences is returned unchanged, so plain ``.sql`` files work too.
+
+    Args:
+        text: LLM response or plain SQL
+
+    Returns:
+        SQL query text
+    """
+    section = _OPTIMIZED_SECTION_RE.search(text)
+    scope = section.group(1) if section else text
+    block = _SQL_BLOCK_RE.search(scope)
+    if block:
+        return block.group(1).strip()
+    return scope.strip()
+
+
+def build_database(
+    tables: Dict[str, TableSpec],
+    rows: int,
+    seed: int = 42,
+    setup_sql: Optional[str] = None,
+) -> sqlite3.Connection:
+    """Create an in-memory SQLite database filled with synthetic rows.
+
+    Args:
+        tables: Table specs keyed by name
+        rows: Rows to generate per table
+        seed: Random seed for reproducible data
+        setup_sql: Optional script run after loading (views, derived tables)
+
+    Returns:
+        Open SQLite connection
+    """
+    conn = sqlite3.connect(":memory:")
+    row_counts = {name: rows for name in tables}
+    for table in tables.values():
+        columns = ", ".join(f'"{c.name}" {c.sqlite_type}' for c in table.columns)
+        placeholders = ", ".join("?" for _ in table.columns)
+        conn.execute(f'CREATE TABLE "{table.name}" ({columns})')
+        conn.executemany(
+            f'INSERT INTO "{table.name}" VALUES ({placeholders})',
+            generate_rows(table, rows, seed=seed, row_counts=row_counts),
+        )
+    if setup_sql:
+        conn.executescript(setup_sql)
+    conn.commit()
+    return conn
+
+
+def _normalize_row(row: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """Round floats so equivalent arithmetic compares equal."""
+    return tuple(round(v, FLOAT_PRECISION) if isinstance(v, float) else v for v in row)
+
+
+def is_ordered(sql: str) -> bool:
+    """Check whether a query's final result has a defined order.
+
+    Only a top-level ``ORDER BY`` counts; ones inside subqueries, CTEs or
+    window definitions (any parenthesized scope) do not order the output.
+
+    Args:
+        sql: Query text
+
+    Returns:
+        True if the query ends with an ``ORDER BY`` clause
+    """
+    for statement in sqlparse.parse(sql):
+        depth = 0
+        for token in statement.flatten():
+            if token.ttype is T.Punctuation and token.value == "(":
+                depth += 1
+            elif token.ttype is T.Punctuation and token.value == ")":
+                depth -= 1
+            elif (
+                depth == 0
+                and token.ttype in T.Keyword
+                and " ".join(token.normalized.split()) == "ORDER BY"
+            ):
+                return True
+    return False
+
+
+def _strip_trailing_semicolon(sql: str) -> str:
+    """Remove a trailing semicolon so the query can be wrapped."""
+    return sql.strip().rstrip(";").strip()
+
+
+def run_query(
+    conn: sqlite3.Connection, sql: str, runs: int = 5
+) -> Tuple[List[Tuple[Any, ...]], List[float]]:
+    """Execute a query repeatedly and time each run.
+
+    Args:
+        conn: SQLite connection
+        sql: Query to execute
+        runs: Number of timed runs
+
+    Returns:
+        Rows from the last run and per-run durations in seconds
+    """
+    sql = _strip_trailing_semicolon(sql)
+    timings = []
+    rows: List[Tuple[Any, ...]] = []
+    for _ in range(max(1, runs)):
+        started = time.perf_counter()
+        rows = conn.execute(sql).fetchall()
+        timings.append(time.perf_counter() - started)
+    return rows, timings
+
+
+def query_plan(conn: sqlite3.Connection, sql: str) -> List[str]:
+    """Return the ``EXPLAIN QUERY PLAN`` output as indented lines.
+
+    Args:
+        conn: SQLite connection
+        sql: Query to explain
+
+    Returns:
+        Plan lines, indented by depth
+    """
+    plan = conn.execute(
+        f"EXPLAIN QUERY PLAN {_strip_trailing_semicolon(sql)}"
+    ).fetchall()
+    depth: Dict[int, int] = {0: -1}
+    lines = []
+    for node_id, parent_id, _, detail in plan:
+        depth[node_id] = depth.get(parent_id, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+def timing_summary(timings: List[float]) -> Dict[str, float]:
+    """Summarize a timing distribution in milliseconds.
+
+    Args:
+        timings: Durations in seconds
+
+    Returns:
+        min, median, p95, max and mean in milliseconds
+    """
+    ordered = sorted(t * 1000 for t in timings)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "min_ms": ordered[0],
+        "median_ms": statistics.median(ordered),
+        "p95_ms": ordered[p95_index],
+        "max_ms": ordered[-1],
+        "mean_ms": statistics.mean(ordered),
+    }
+
+
+def verify_rewrite(
+    conn: sqlite3.Connection, original: str, optimized: str, runs: int = 5
+) -> Dict[str, Any]:
+    """Compare an original query with its rewrite on the same data.
+
+    Args:
+        conn: SQLite connection with the synthetic tables loaded
+        original: Original SQL
+        optimized: Rewritten SQL
+        runs: Timed runs per query
+
+    Returns:
+        Report with equivalence, timing distributions, speedup and plan diff
+    """
+    report: Dict[str, Any] = {"runs": runs, "errors": {}}
+    results: Dict[str, List[Tuple[Any, ...]]] = {}
+    for label, sql in (("original", original), ("optimized", optimized)):
+        try:
+            rows, timings = run_query(conn, sql, runs)
+            results[label] = [_normalize_row(r) for r in rows]
+            report[label] = {
+                "rows": len(rows),
+                "timings": timing_summary(timings),
+                "plan": query_plan(conn, sql),
+            }
+        except sqlite3.Error as e:
+            report["errors"][label] = str(e)
+
+    if report["errors"]:
+        report["equivalent"] = False
+        return report
+
+    ordered = is_ordered(_strip_trailing_semicolon(original))
+    same_rows = Counter(results["original"]) == Counter(results["optimized"])
+    report["equivalent"] = same_rows and (
+        not ordered or results["original"] == results["optimized"]
+    )
+    report["same_rows_any_order"] = same_rows
+    report["order_sensitive"] = ordered
+    report["speedup"] = report["original"]["timings"]["median_ms"] / max(
+        report["optimized"]["timings"]["median_ms"], 1e-9
+    )
+    report["plan_diff"] = list(
+        difflib.unified_diff(
+            report["original"]["plan"],
+            report["optimized"]["plan"],
+            fromfile="original",
+            tofile="optimized",
+            lineterm="",
+        )
+    )
+    return report
@@ -0,0 +1,500 @@
+"""Synthetic data generation driven by the pipeline's JSON Schemas."""
+
+import csv
+import io
+import json
+import os
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from copilot_cli.utils.file_utils import parse_json_file
+
+# Small vocabularies for commonly named string columns
+VOCABULARIES: Dict[str, List[str]] = {
+    "first_name": ["Ava", "Liam", "Maya", "Noah", "Priya", "Omar", "Sofia", "Kenji"],
+    "last_name": [
+        "Smith",
+        "Garcia",
+        "Chen",
+        "Patel",
+        "Okafor",
+        "Kim",
+        "Rossi",
+        "Novak",
+    ],
+    "city": ["Austin", "Berlin", "Chennai", "Lagos", "Lyon", "Osaka", "Toronto"],
+    "state": ["CA", "TX", "NY", "WA", "IL", "MA", "FL"],
+    "country": ["US", "DE", "IN", "NG", "FR", "JP", "CA"],
+    "category": ["electronics", "apparel", "home", "books", "toys", "grocery"],
+    "preferred_language": ["en", "es", "de", "fr", "ja", "hi"],
+}
+
+# Epoch-second ranges for date formats
+_RECENT_RANGE = (
+    int(datetime(2020, 1, 1, tzinfo=timezone.utc).timestamp()),
+    int(datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()),
+)
+_BIRTH_RANGE = (
+    int(datetime(1950, 1, 1, tzinfo=timezone.utc).timestamp()),
+    int(datetime(2006, 1, 1, tzinfo=timezone.utc).timestamp()),
+)
+
+# Probability that an optional column is null
+NULL_RATE = 0.1
+
+# Rows per independently seeded block of random values
+RNG_BLOCK = 4096
+
+SQLITE_TYPES = {
+    "string": "TEXT",
+    "number": "REAL",
+    "integer": "INTEGER",
+    "boolean": "INTEGER",
+}
+
+
+class ColumnSpec:
+    """A flattened, generatable column derived from a JSON Schema property."""
+
+    def __init__(
+        self,
+        name: str,
+        type: str,
+        format: Optional[str] = None,
+        enum: Optional[List[Any]] = None,
+        required: bool = False,
+        path: Optional[Tuple[str, ...]] = None,
+    ):
+        """Initialize the column.
+
+        Args:
+            name: Column name (nested properties are joined with underscores)
+            type: JSON Schema type (string, number, integer or boolean)
+            format: JSON Schema format (email, date, date-time)
+            enum: Allowed values, if restricted
+            required: Whether the column is never null
+            path: Property path in the original (nested) schema
+        """
+        self.name = name
+        self.path = path or (name,)
+        self.type = type
+        self.format = format
+        self.enum = enum
+        self.required = required
+        # Table whose primary key this column references
+        self.references: Optional[str] = None
+
+    @property
+    def sqlite_type(self) -> str:
+        """SQLite column affinity for this column."""
+        return SQLITE_TYPES.get(self.type, "TEXT")
+
+
+class TableSpec:
+    """A table of columns generated from one JSON Schema."""
+
+    def __init__(self, name: str, columns: List[ColumnSpec]):
+        """Initialize the table.
+
+        Args:
+            name: Table name
+            columns: Flattened columns
+        """
+        self.name = name
+        self.columns = columns
+        self.primary_key = next(
+            (c.name for c in columns if c.required and c.name.endswith("_id")), None
+        )
+
+    def column(self, name: str) -> Optional[ColumnSpec]:
+        """Return a column by name, if present."""
+        return next((c for c in self.columns if c.name == name), None)
+
+
+def table_name_for(schema_path: str) -> str:
+    """Derive a table name from a schema file name.
+
+    Args:
+        schema_path: Path like ``schemas/crm_export_schema.json``
+
+    Returns:
+        Table name like ``crm_export``
+    """
+    stem = Path(schema_path).stem
+    return stem[: -len("_schema")] if stem.endswith("_schema") else stem
+
+
+def _flatten(
+    properties: Dict[str, Any], required: List[str], parents: Tuple[str, ...] = ()
+) -> List[ColumnSpec]:
+    """Flatten (possibly nested) schema properties into columns."""
+    columns = []
+    for name, prop in properties.items():
+        path = parents + (name,)
+        column_name = "_".join(path)
+        prop_type = prop.get("type", "string")
+        if isinstance(prop_type, list):
+            prop_type = next((t for t in prop_type if t != "null"), "string")
+
+        if prop_type == "object":
+            columns.extend(
+                _flatten(
+                    prop.get("properties", {}),
+                    prop.get("required", []),
+                    parents=path,
+                )
+            )
+            continue
+
+        columns.append(
+            ColumnSpec(
+                column_name,
+                prop_type,
+                format=prop.get("format"),
+                enum=prop.get("enum"),
+                required=name in required and not parents,
+                path=path,
+            )
+        )
+    return columns
+
+
+def load_table_spec(name: str, schema: Dict[str, Any]) -> TableSpec:
+    """Build a table spec from a JSON Schema object.
+
+    Args:
+        name: Table name
+        schema: Parsed JSON Schema with ``properties``
+
+    Returns:
+        Table spec with flattened columns
+    """
+    return TableSpec(
+        name, _flatten(schema.get("properties", {}), schema.get("required", []))
+    )
+
+
+def resolve_foreign_keys(tables: Dict[str, TableSpec]) -> None:
+    """Link columns that share a name with another table's primary key.
+
+    ``customer_events.customer_id`` becomes a reference to ``crm_export``
+    because ``customer_id`` is the primary key there.
+
+    Args:
+        tables: Table specs keyed by name (modified in place)
+    """
+    owners = {t.primary_key: t.name for t in tables.values() if t.primary_key}
+    for table in tables.values():
+        for column in table.columns:
+            owner = owners.get(column.name)
+            if owner is not None and owner != table.name:
+                column.references = owner
+
+
+def load_tables(schema_paths: Dict[str, str]) -> Dict[str, TableSpec]:
+    """Load table specs from schema files and resolve their relationships.
+
+    Args:
+        schema_paths: Schema file paths keyed by table name
+
+    Returns:
+        Table specs keyed by name
+    """
+    tables = {
+        name: load_table_spec(name, parse_json_file(path))
+        for name, path in schema_paths.items()
+    }
+    resolve_foreign_keys(tables)
+    return tables
+
+
+def key_values(column: str, indices: np.ndarray) -> np.ndarray:
+    """Format surrogate keys for row indices of a ``*_id`` column.
+
+    Parent and child tables share this format so generated foreign keys join.
+
+    Args:
+        column: Key column name, e.g. ``customer_id``
+        indices: Row indices in the parent table
+
+    Returns:
+        Keys like ``customer_0000000042``
+    """
+    prefix = column[:-3] if column.endswith("_id") else column
+    return np.char.add(f"{prefix}_", np.char.zfill(indices.astype(str), 10))
+
+
+def _draw_rows(
+    seed: int,
+    table: str,
+    column: str,
+    start: int,
+    count: int,
+    draw: Callable[[np.random.Generator, int], np.ndarray],
+    stream: int = 0,
+) -> np.ndarray:
+    """Draw random values for rows ``start`` to ``start + count``.
+
+    Each block of ``RNG_BLOCK`` rows has its own generator, so a row's values
+    depend only on the seed and never on chunk size or worker count.
+
+    Args:
+        seed: Random seed
+        table: Table name
+        column: Column name
+        start: Index of the first row
+        count: Number of rows
+        draw: Draws ``n`` values from a generator
+        stream: Independent stream within the column (e.g. nulls)
+
+    Returns:
+        One value per row
+    """
+    column_hash = zlib.crc32(f"{table}.{column}".encode("utf-8"))
+    first = start // RNG_BLOCK
+    last = max(first, (start + count - 1) // RNG_BLOCK)
+    blocks = [
+        draw(np.random.default_rng([seed, column_hash, stream, block]), RNG_BLOCK)
+        for block in range(first, last + 1)
+    ]
+    offset = start - first * RNG_BLOCK
+    values: np.ndarray = np.concatenate(blocks)[offset : offset + count]
+    return values
+
+
+def _generate_column(
+    table: TableSpec,
+    column: ColumnSpec,
+    start: int,
+    count: int,
+    seed: int,
+    row_counts: Dict[str, int],
+) -> np.ma.MaskedArray:
+    """Generate ``count`` values for one column starting at row ``start``."""
+
+    def draw(
+        fn: Callable[[np.random.Generator, int], np.ndarray], stream: int = 0
+    ) -> np.ndarray:
+        return _draw_rows(seed, table.name, column.name, start, count, fn, stream)
+
+    rows = np.arange(start, start + count, dtype=np.int64)
+
+    if column.name == table.primary_key:
+        values = key_values(column.name, rows)
+    elif column.references is not None:
+        parent_rows = max(1, row_counts.get(column.references, count))
+        values = key_values(
+            column.name, draw(lambda rng, n: rng.integers(0, parent_rows, n))
+        )
+    elif column.enum:
+        enum = column.enum
+        values = np.asarray(enum)[draw(lambda rng, n: rng.integers(0, len(enum), n))]
+    elif column.format in ("date", "date-time"):
+        low, high = _BIRTH_RANGE if "birth" in column.name else _RECENT_RANGE
+        moments = draw(lambda rng, n: rng.integers(low, high, n)).astype(
+            "datetime64[s]"
+        )
+        if column.format == "date":
+            values = np.datetime_as_string(moments, unit="D")
+        else:
+            values = np.char.add(np.datetime_as_string(moments, unit="s"), "Z")
+    elif column.format == "email":
+        values = np.char.add(np.char.add("user", rows.astype(str)), "@example.com")
+    elif column.type == "number":
+        values = np.round(draw(lambda rng, n: rng.uniform(0, 1000, n)), 2)
+    elif column.type == "integer":
+        values = draw(lambda rng, n: rng.integers(0, 1000, n))
+    elif column.type == "boolean":
+        values = draw(lambda rng, n: rng.random(n)) < 0.5
+    else:
+        vocabulary = next(
+            (v for k, v in VOCABULARIES.items() if column.name.endswith(k)), None
+        )
+        if vocabulary:
+            words = vocabulary
+            values = np.asarray(words)[
+                draw(lambda rng, n: rng.integers(0, len(words), n))
+            ]
+        else:
+            cardinality = max(1, row_counts.get(table.name, count)) * 10
+            values = np.char.add(
+                f"{column.name}_",
+                draw(lambda rng, n: rng.integers(0, cardinality, n)).astype(str),
+            )
+
+    if column.required or column.name == table.primary_key:
+        nulls = np.zeros(count, dtype=bool)
+    else:
+        nulls = draw(lambda rng, n: rng.random(n), stream=1) < NULL_RATE
+    return np.ma.masked_array(values, mask=nulls)
+
+
+def generate_columns(
+    table: TableSpec,
+    count: int,
+    seed: int = 42,
+    row_counts: Optional[Dict[str, int]] = None,
+    start: int = 0,
+) -> Dict[str, np.ma.MaskedArray]:
+    """Generate a chunk of a table as one array per column.
+
+    Args:
+        table: Table to generate
+        count: Number of rows
+        seed: Random seed; the same seed always yields the same rows
+        row_counts: Rows generated per table, used to bound foreign keys
+        start: Index of the first row (for chunked generation)
+
+    Returns:
+        Column arrays keyed by column name; null values are masked
+    """
+    row_counts = row_counts or {}
+    return {
+        column.name: _generate_column(table, column, start, count, seed, row_counts)
+        for column in table.columns
+    }
+
+
+def generate_rows(
+    table: TableSpec,
+    count: int,
+    seed: int = 42,
+    row_counts: Optional[Dict[str, int]] = None,
+    start: int = 0,
+) -> Iterator[Tuple[Any, ...]]:
+    """Generate rows for a table as Python tuples.
+
+    Args:
+        table: Table to generate
+        count: Number of rows
+        seed: Random seed; the same seed always yields the same rows
+        row_counts: Rows generated per table, used to bound foreign keys
+        start: Index of the first row (for chunked generation)
+
+    Yields:
+        Row tuples in ``table.columns`` order
+    """
+    columns = generate_columns(table, count, seed, row_counts, start)
+    return zip(*(values.tolist() for values in columns.values()))
+
+
+def _csv_field(column: ColumnSpec, values: np.ma.MaskedArray) -> List[str]:
+    """Serialize one column to CSV field strings without a per-row loop."""
+    if column.type == "boolean":
+        text = np.where(values.data, "true", "false")
+    else:
+        text = values.data.astype(str)
+
+    # Generated keys, dates and tokens never need quoting; schema enums might
+    if column.enum:
+        special = (
+            (np.char.find(text, ",") >= 0)
+            | (np.char.find(text, '"') >= 0)
+            | (np.char.find(text, "\n") >= 0)
+        )
+        if special.any():
+            quoted = np.char.add(
+                np.char.add('"', np.char.replace(text, '"', '""')), '"'
+            )
+            text = np.where(special, quoted, text)
+
+    fields: List[str] = np.where(np.ma.getmaskarray(values), "", text).tolist()
+    return fields
+
+
+def _render_chunk(
+    table: TableSpec,
+    start: int,
+    count: int,
+    seed: int,
+    row_counts: Dict[str, int],
+    fmt: str,
+) -> str:
+    """Generate and serialize one chunk (runs in a worker process)."""
+    columns = generate_columns(table, count, seed, row_counts, start)
+
+    if fmt == "csv":
+        fields = [_csv_field(c, columns[c.name]) for c in table.columns]
+        return "".join(",".join(row) + "\n" for row in zip(*fields))
+
+    buffer = io.StringIO()
+    rows = zip(*(values.tolist() for values in columns.values()))
+    for row in rows:
+        record: Dict[str, Any] = {}
+        for column, value in zip(table.columns, row):
+            # Optional properties are omitted rather than null, as the schemas
+            # do not allow null values
+            if value is None:
+                continue
+            target = record
+            for key in column.path[:-1]:
+                target = target.setdefault(key, {})
+            target[column.path[-1]] = value
+        buffer.write(json.dumps(record, separators=(",", ":")))
+        buffer.write("\n")
+    return buffer.getvalue()
+
+
+def write_table(
+    table: TableSpec,
+    rows: int,
+    output_path: str,
+    fmt: str = "csv",
+    seed: int = 42,
+    row_counts: Optional[Dict[str, int]] = None,
+    chunk_size: int = 100_000,
+    workers: Optional[int] = None,
+) -> int:
+    """Generate a table in parallel chunks and stream it to a file.
+
+    At most ``2 * workers`` chunks are in flight at once, so memory stays
+    bounded regardless of the total row count.
+
+    Args:
+        table: Table to generate
+        rows: Total rows to write
+        output_path: Destination file
+        fmt: ``csv`` or ``ndjson``
+        seed: Random seed
+        row_counts: Rows generated per table, used to bound foreign keys
+        chunk_size: Rows per chunk
+        workers: Worker processes (defaults to the CPU count)
+
+    Returns:
+        Number of rows written
+    """
+    if fmt not in ("csv", "ndjson"):
+        raise ValueError(f"Unsupported format: {fmt}")
+
+    row_counts = row_counts or {table.name: rows}
+    workers = workers or os.cpu_count() or 1
+    chunks = (
+        (start, min(chunk_size, rows - start)) for start in range(0, rows, chunk_size)
+    )
+
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            csv.writer(f, lineterminator="\n").writerow(c.name for c in table.columns)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending: Deque[Future] = deque()
+            for start, count in chunks:
+                pending.append(
+                    executor.submit(
+                        _render_chunk, table, start, count, seed, row_counts, fmt
+                    )
+                )
+                if len(pending) >= 2 * workers:
+                    f.write(pending.popleft().result())
+            while pending:
+                f.write(pending.popleft().result())
+
+    return rows
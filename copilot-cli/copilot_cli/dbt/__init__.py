@@ -0,0 +1 @@
+"""dbt project analysis for the Data Engineering Copilot."""
@@ -0,0 +1,162 @@
+"""Lightweight local rendering of dbt model Jinja to plain SQL."""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Bump when rendering rules change so cached output is invalidated
+RENDERER_VERSION = "1"
+
+_COMMENT_RE = re.compile(r"{#.*?#}", re.DOTALL)
+_INCREMENTAL_RE = re.compile(
+    r"{%-?\s*if\s+is_incremental\(\)\s*-?%}(.*?)"
+    r"(?:{%-?\s*else\s*-?%}(.*?))?{%-?\s*endif\s*-?%}",
+    re.DOTALL,
+)
+_CONFIG_RE = re.compile(r"{{-?\s*config\(.*?\)\s*-?}}", re.DOTALL)
+_REF_RE = re.compile(r"{{-?\s*ref\(\s*(['\"][^)]*?)\)\s*-?}}")
+_SOURCE_RE = re.compile(
+    r"{{-?\s*source\(\s*['\"]([^'\"]+)['\"]\s*,\s*['\"]([^'\"]+)['\"]\s*\)\s*-?}}"
+)
+_VAR_RE = re.compile(
+    r"{{-?\s*var\(\s*['\"]([^'\"]+)['\"]\s*(?:,\s*(.*?))?\)\s*-?}}", re.DOTALL
+)
+_THIS_RE = re.compile(r"{{-?\s*this\s*-?}}")
+_EXPRESSION_RE = re.compile(r"{{.*?}}|{%.*?%}", re.DOTALL)
+_QUOTED_RE = re.compile(r"['\"]([^'\"]+)['\"]")
+
+
+def _ref_name(arguments: str) -> str:
+    """Return the model name from ``ref('model')`` or ``ref('pkg', 'model')``."""
+    names = _QUOTED_RE.findall(arguments)
+    return names[-1] if names else arguments.strip()
+
+
+def find_refs(source: str) -> List[str]:
+    """List the models a dbt model selects from via ``ref()``.
+
+    Args:
+        source: Raw model SQL with Jinja
+
+    Returns:
+        Referenced model names in order of first use
+    """
+    refs: List[str] = []
+    for match in _REF_RE.finditer(_COMMENT_RE.sub("", source)):
+        name = _ref_name(match.group(1))
+        if name not in refs:
+            refs.append(name)
+    return refs
+
+
+def render_model(
+    name: str,
+    source: str,
+    variables: Optional[Dict[str, str]] = None,
+    schema: Optional[str] = None,
+) -> Tuple[str, List[str]]:
+    """Render a dbt model to plain SQL without a dbt installation.
+
+    Handles ``ref()``, ``source()``, ``var()``, ``this`` and ``config()``, and
+    compiles ``is_incremental()`` blocks as a full refresh. Anything else is
+    removed and reported so the caller can flag the model as approximate.
+
+    Args:
+        name: Model name
+        source: Raw model SQL with Jinja
+        variables: Values for ``var()`` calls
+        schema: Optional schema prefix for ``ref()`` and ``this``
+
+    Returns:
+        Compiled SQL and a list of Jinja expressions that were not rendered
+    """
+    variables = variables or {}
+    prefix = f"{schema}." if schema else ""
+
+    def render_var(match: "re.Match[str]") -> str:
+        if match.group(1) in variables:
+            return str(variables[match.group(1)])
+        default = (match.group(2) or "").strip()
+        return default.strip("'\"") if default else "NULL"
+
+    sql = _COMMENT_RE.sub("", source)
+    sql = _INCREMENTAL_RE.sub(lambda m: m.group(2) or "", sql)
+    sql = _CONFIG_RE.sub("", sql)
+    sql = _REF_RE.sub(lambda m: prefix + _ref_name(m.group(1)), sql)
+    sql = _SOURCE_RE.sub(lambda m: f"{m.group(1)}.{m.group(2)}", sql)
+    sql = _VAR_RE.sub(render_var, sql)
+    sql = _THIS_RE.sub(prefix + name, sql)
+
+    unrendered = [m.group(0) for m in _EXPRESSION_RE.finditer(sql)]
+    sql = _EXPRESSION_RE.sub("", sql)
+    return sql.strip() + "\n", unrendered
+
+
+def cache_key(
+    source: str,
+    upstream_keys: List[str],
+    variables: Dict[str, str],
+    schema: Optional[str] = None,
+) -> str:
+    """Hash a model together with the cache keys of its upstream models.
+
+    Any change to a model, to anything it depends on, or to the rendering
+    inputs changes the key.
+
+    Args:
+        source: Raw model SQL
+        upstream_keys: Cache keys of the models it references
+        variables: Values for ``var()`` calls
+        schema: Schema prefix for ``ref()`` and ``this``
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    digest.update(RENDERER_VERSION.encode("utf-8"))
+    digest.update(source.encode("utf-8"))
+    digest.update(f"schema={schema or ''}".encode("utf-8"))
+    for key in sorted(upstream_keys):
+        digest.update(key.encode("utf-8"))
+    for name, value in sorted(variables.items()):
+        digest.update(f"{name}={value}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CompiledCache:
+    """On-disk cache of compiled model SQL keyed by ``cache_key``."""
+
+    def __init__(self, directory: str):
+        """Initialize the cache.
+
+        Args:
+            directory: Directory holding cached ``<key>.json`` entries
+        """
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Tuple[str, List[str]]]:
+        """Return cached SQL and unrendered expressions for a key, if present."""
+        path = self.directory / f"{key}.json"
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["sql"], entry.get("unrendered", [])
+
+    def put(self, key: str, sql: str, unrendered: List[str]) -> None:
+        """Store compiled SQL for a key."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{key}.json"
+        tmp = self.directory / f"{key}.{os.getpid()}.tmp"
+        tmp.write_text(
+            json.dumps({"sql": sql, "unrendered": unrendered}), encoding="utf-8"
+        )
+        # Atomic rename so concurrent runs never read a partial entry
+        tmp.replace(path)
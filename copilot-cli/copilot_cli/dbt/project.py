@@ -0,0 +1,205 @@
+"""Dependency-ordered compilation and review of a dbt models tree."""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from copilot_cli.dbt.compiler import CompiledCache, cache_key, find_refs, render_model
+from copilot_cli.llm.analysis import AnalysisResult, run_analysis
+from copilot_cli.llm.ollama_client import OllamaClient
+from copilot_cli.utils.file_utils import read_file
+from prompts.dbt_generation import DBT_MODEL_REVIEW_PROMPT
+
+# Characters of each upstream review passed to downstream prompts
+MAX_FINDING_CHARS = 1500
+
+
+class DbtModel:
+    """A model file in a dbt project."""
+
+    def __init__(self, name: str, path: str, source: str):
+        """Initialize the model.
+
+        Args:
+            name: Model name (file stem)
+            path: Path to the model file
+            source: Raw model SQL with Jinja
+        """
+        self.name = name
+        self.path = path
+        self.source = source
+        self.refs = find_refs(source)
+        self.depends_on: List[str] = []
+        self.compiled: Optional[str] = None
+        self.cache_key: Optional[str] = None
+        self.unrendered: List[str] = []
+        self.cache_hit = False
+
+
+class DbtProject:
+    """The models of a dbt project and the dependencies between them."""
+
+    def __init__(
+        self,
+        models_dir: str,
+        variables: Optional[Dict[str, str]] = None,
+        schema: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+    ):
+        """Load every model under a models directory.
+
+        Args:
+            models_dir: dbt ``models`` directory
+            variables: Values for ``var()`` calls
+            schema: Optional schema prefix for rendered ``ref()`` calls
+            cache_dir: Compiled SQL cache directory (defaults to
+                ``.copilot_cache/dbt`` next to the models directory)
+
+        Raises:
+            ValueError: If two models share a name
+        """
+        self.models_dir = Path(models_dir)
+        self.variables = variables or {}
+        self.schema = schema
+        self.cache = CompiledCache(
+            cache_dir or str(self.models_dir.parent / ".copilot_cache" / "dbt")
+        )
+
+        self.models: Dict[str, DbtModel] = {}
+        for path in sorted(self.models_dir.rglob("*.sql")):
+            if path.stem in self.models:
+                raise ValueError(
+                    f"Duplicate model name {path.stem}: {self.models[path.stem].path}, {path}"
+                )
+            self.models[path.stem] = DbtModel(
+                path.stem, str(path), read_file(str(path))
+            )
+
+        for model in self.models.values():
+            # refs to packages or missing models are treated as external tables
+            model.depends_on = [r for r in model.refs if r in self.models]
+
+    def levels(self) -> List[List[str]]:
+        """Group models so every model's dependencies are in earlier levels.
+
+        Returns:
+            Model names per level, starting with models that have no parents
+
+        Raises:
+            ValueError: If models reference each other in a cycle
+        """
+        depth: Dict[str, int] = {}
+        visiting = set()
+
+        def visit(name: str) -> int:
+            if name in depth:
+                return depth[name]
+            if name in visiting:
+                raise ValueError(f"Circular ref() involving model {name}")
+            visiting.add(name)
+            parents = self.models[name].depends_on
+            depth[name] = 1 + max((visit(p) for p in parents), default=-1)
+            visiting.discard(name)
+            return depth[name]
+
+        for name in self.models:
+            visit(name)
+
+        levels: List[List[str]] = [
+            [] for _ in range(max(depth.values(), default=-1) + 1)
+        ]
+        for name in sorted(self.models):
+            levels[depth[name]].append(name)
+        return levels
+
+    def compile(self) -> Dict[str, str]:
+        """Render every model to plain SQL, reusing cached output.
+
+        Returns:
+            Compiled SQL keyed by model name
+        """
+        for level in self.levels():
+            for name in level:
+                model = self.models[name]
+                upstream = [self.models[p].cache_key or "" for p in model.depends_on]
+                model.cache_key = cache_key(
+                    model.source, upstream, self.variables, self.schema
+                )
+
+                cached = self.cache.get(model.cache_key)
+                model.cache_hit = cached is not None
+                if cached is not None:
+                    model.compiled, model.unrendered = cached
+                else:
+                    model.compiled, model.unrendered = render_model(
+                        name, model.source, self.variables, self.schema
+                    )
+                    self.cache.put(model.cache_key, model.compiled, model.unrendered)
+        return {name: model.compiled or "" for name, model in self.models.items()}
+
+    def review(
+        self,
+        client: OllamaClient,
+        workers: int = 4,
+        model: Optional[str] = None,
+        on_result: Optional[Callable[[AnalysisResult], None]] = None,
+    ) -> List[AnalysisResult]:
+        """Review every model with the LLM in dependency order.
+
+        Models in the same level run in parallel; each prompt includes the
+        reviews of the model's direct upstream models, so wall-clock time
+        scales with the depth of the project rather than its size.
+
+        Args:
+            client: Ollama client used for generation
+            workers: Concurrent generations per level
+            model: Optional model override
+            on_result: Called with each result as soon as it completes
+
+        Returns:
+            Results in the order they completed
+        """
+        self.compile()
+        findings: Dict[str, AnalysisResult] = {}
+
+        def review_model(name: str) -> AnalysisResult:
+            dbt_model = self.models[name]
+            upstream = "\n\n".join(
+                f"### {parent}\n{self._finding(findings[parent])}"
+                for parent in dbt_model.depends_on
+            )
+            result = run_analysis(
+                client,
+                dbt_model.path,
+                "dbt_review",
+                DBT_MODEL_REVIEW_PROMPT,
+                model,
+                model_name=name,
+                compiled_sql=dbt_model.compiled or "",
+                upstream_findings=upstream
+                or "None (this model has no upstream models)",
+            )
+            result.cache["compiled"] = "hit" if dbt_model.cache_hit else "miss"
+            return result
+
+        results = []
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for level in self.levels():
+                futures = {executor.submit(review_model, name): name for name in level}
+                for future in as_completed(futures):
+                    result = future.result()
+                    findings[futures[future]] = result
+                    results.append(result)
+                    if on_result is not None:
+                        on_result(result)
+        return results
+
+    @staticmethod
+    def _finding(result: AnalysisResult) -> str:
+        """Summarize an upstream review for a downstream prompt."""
+        if not result.ok:
+            return f"(review failed: {result.error})"
+        text = result.response or ""
+        if len(text) > MAX_FINDING_CHARS:
+            return text[:MAX_FINDING_CHARS].rstrip() + "\n[truncated]"
+        return text
@@ -0,0 +1,317 @@
+"""Artifact analysis dispatch for the Data Engineering Copilot."""
+
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from copilot_cli.llm.ollama_client import GenerationCancelled, OllamaClient
+from copilot_cli.utils.file_utils import (
+    get_file_extension,
+    parse_python_file,
+    parse_sql_file,
+    read_file,
+)
+from prompts.dag_explanation import DAG_EXPLANATION_PROMPT
+from prompts.dbt_generation import DBT_SCHEMA_ANALYSIS_PROMPT
+from prompts.sql_optimization import SQL_OPTIMIZATION_PROMPT
+
+# Extension -> (analysis name, prompt template, template field, file loader)
+ANALYSES: Dict[str, Tuple[str, str, str, Callable[[str], str]]] = {
+    ".sql": ("sql_optimization", SQL_OPTIMIZATION_PROMPT, "sql_query", parse_sql_file),
+    ".py": ("dag_explanation", DAG_EXPLANATION_PROMPT, "dag_code", parse_python_file),
+    ".json": ("schema_analysis", DBT_SCHEMA_ANALYSIS_PROMPT, "schema", read_file),
+    ".yaml": ("schema_analysis", DBT_SCHEMA_ANALYSIS_PROMPT, "schema", read_file),
+    ".yml": ("schema_analysis", DBT_SCHEMA_ANALYSIS_PROMPT, "schema", read_file),
+}
+
+SUPPORTED_EXTENSIONS: List[str] = list(ANALYSES)
+
+_HEADING_RE = re.compile(r"^##\s+(.+?)\s*#*\s*$")
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+class AnalysisResult:
+    """Outcome of analyzing a single artifact."""
+
+    def __init__(
+        self,
+        path: str,
+        analysis: str,
+        response: Optional[str] = None,
+        error: Optional[Exception] = None,
+        model: Optional[str] = None,
+        timings: Optional[Dict[str, Any]] = None,
+        cache: Optional[Dict[str, Any]] = None,
+    ):
+        """Initialize the result.
+
+        Args:
+            path: Artifact that was analyzed
+            analysis: Name of the analysis that ran
+            response: Generated text, if the analysis succeeded
+            error: Exception raised, if the analysis failed
+            model: Model that produced the response
+            timings: Start time and durations of the analysis
+            cache: Cache and coalescing status of the analysis
+        """
+        self.path = path
+        self.analysis = analysis
+        self.response = response
+        self.error = error
+        self.model = model
+        self.timings = timings or {}
+        self.cache = cache or {}
+
+    @property
+    def ok(self) -> bool:
+        """Whether the analysis succeeded."""
+        return self.error is None
+
+    @property
+    def sections(self) -> Dict[str, str]:
+        """The response split into its ``## `` sections."""
+        return parse_sections(self.response or "")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {
+            "path": self.path,
+            "analysis": self.analysis,
+            "model": self.model,
+            "response": self.response,
+            "error": str(self.error) if self.error else None,
+            "timings": self.timings,
+            "cache": self.cache,
+        }
+
+
+def parse_sections(text: str) -> Dict[str, str]:
+    """Split a Markdown response into its ``## `` sections.
+
+    Headings inside fenced code blocks are ignored. Text before the first
+    heading is kept under ``preamble``.
+
+    Args:
+        text: Generated Markdown
+
+    Returns:
+        Section bodies keyed by snake_case heading, in order
+    """
+    sections: Dict[str, List[str]] = {}
+    current = "preamble"
+    in_fence = False
+    for line in text.splitlines():
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        match = None if in_fence else _HEADING_RE.match(line)
+        if match:
+            current = _SLUG_RE.sub("_", match.group(1).lower()).strip("_") or current
+            sections.setdefault(current, [])
+        else:
+            sections.setdefault(current, []).append(line)
+    bodies = {name: "\n".join(lines).strip() for name, lines in sections.items()}
+    if not bodies.get("preamble"):
+        bodies.pop("preamble", None)
+    return bodies
+
+
+def run_analysis(
+    client: OllamaClient,
+    path: str,
+    analysis: str,
+    template: str,
+    model: Optional[str] = None,
+    cancel: Optional[threading.Event] = None,
+    **fields: str,
+) -> AnalysisResult:
+    """Generate from a template and record the model, timings and cache status.
+
+    Args:
+        client: Ollama client used for generation
+        path: Artifact being analyzed
+        analysis: Name of the analysis
+        template: Prompt template
+        model: Optional model override
+        cancel: Optional event that cancels the generation when set
+        **fields: Values substituted into the template
+
+    Returns:
+        Analysis result (errors are captured, not raised)
+    """
+    info: Dict[str, Any] = {}
+    started_at = time.time()
+    start = time.monotonic()
+    response: Optional[str] = None
+    error: Optional[Exception] = None
+    try:
+        response = client.generate_from_template(
+            template,
+            model=model,
+            cancel=cancel,
+            # Passed explicitly so no template field can bind to it
+            deadline=None,
+            info=info,
+            **fields,
+        )
+    except Exception as e:
+        error = e
+    return AnalysisResult(
+        path,
+        analysis,
+        response=response,
+        error=error,
+        model=info.get("model", model or client.model),
+        timings={
+            "started_at": started_at,
+            "total_seconds": time.monotonic() - start,
+            "generation_seconds": info.get("generation_seconds"),
+        },
+        cache={"coalesced": info.get("coalesced", False)},
+    )
+
+
+def is_supported(file_path: str) -> bool:
+    """Check whether a file has an analysis registered for it.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        True if the file can be analyzed
+    """
+    return get_file_extension(file_path) in ANALYSES
+
+
+def analyze_file(
+    client: OllamaClient,
+    file_path: str,
+    model: Optional[str] = None,
+    cancel: Optional[threading.Event] = None,
+) -> AnalysisResult:
+    """Run the analysis registered for a file's extension.
+
+    Args:
+        client: Ollama client used for generation
+        file_path: Artifact to analyze
+        model: Optional model override
+        cancel: Optional event that cancels the generation when set
+
+    Returns:
+        Analysis result (errors are captured, not raised)
+    """
+    name, template, field, loader = ANALYSES[get_file_extension(file_path)]
+    try:
+        content = loader(file_path)
+    except Exception as e:
+        return AnalysisResult(file_path, name, error=e)
+    return run_analysis(
+        client, file_path, name, template, model, cancel, **{field: content}
+    )
+
+
+def analyze_files(
+    client: OllamaClient,
+    file_paths: List[str],
+    workers: int = 4,
+    model: Optional[str] = None,
+) -> Iterator[AnalysisResult]:
+    """Analyze many artifacts concurrently, yielding results as they complete.
+
+    Duplicate artifacts submitted together are coalesced by the client, so only
+    one generation runs per distinct (model, template, artifact). At most
+    ``2 * workers`` analyses are pending at a time, so memory stays bounded no
+    matter how many files are analyzed.
+
+    Args:
+        client: Ollama client used for generation
+        file_paths: Artifacts to analyze
+        workers: Number of concurrent generations
+        model: Optional model override
+
+    Yields:
+        Analysis results in completion order
+    """
+    workers = max(1, workers)
+    paths = iter(p for p in file_paths if is_supported(p))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: Set["Future[AnalysisResult]"] = set()
+        while True:
+            for path in paths:
+                pending.add(executor.submit(analyze_file, client, path, model))
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+class WatchSession:
+    """Re-analyze artifacts as they change, reusing one warm client.
+
+    Each file has at most one generation in flight; a newer change to the same
+    file cancels the previous generation so stale results are never reported.
+    """
+
+    def __init__(
+        self,
+        client: OllamaClient,
+        on_result: Callable[[AnalysisResult], None],
+        workers: int = 2,
+        model: Optional[str] = None,
+    ):
+        """Initialize the session.
+
+        Args:
+            client: Ollama client shared by every analysis in the session
+            on_result: Called with each non-cancelled result
+            workers: Number of concurrent generations
+            model: Optional model override
+        """
+        self.client = client
+        self.on_result = on_result
+        self.model = model
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}
+
+    def submit(self, file_path: str) -> None:
+        """Schedule analysis of a changed file, cancelling any stale run.
+
+        Args:
+            file_path: Path of the changed file
+        """
+        if not is_supported(file_path):
+            return
+
+        cancel = threading.Event()
+        with self._lock:
+            previous = self._inflight.get(file_path)
+            if previous is not None:
+                previous.set()
+            self._inflight[file_path] = cancel
+
+        self._executor.submit(self._run, file_path, cancel)
+
+    def _run(self, file_path: str, cancel: threading.Event) -> None:
+        """Analyze a file and report the result unless it was superseded."""
+        result = analyze_file(self.client, file_path, self.model, cancel)
+
+        with self._lock:
+            if self._inflight.get(file_path) is cancel:
+                del self._inflight[file_path]
+
+        if cancel.is_set() or isinstance(result.error, GenerationCancelled):
+            return
+        self.on_result(result)
+
+    def close(self) -> None:
+        """Cancel in-flight generations and shut down the worker pool."""
+        with self._lock:
+            for cancel in self._inflight.values():
+                cancel.set()
+            self._inflight.clear()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,134 @@
+"""Request coalescing for duplicate generations."""
+
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import sqlparse
+
+# Template fields holding SQL or Python, which get language-aware normalization
+FIELD_KINDS = {
+    "sql_query": "sql",
+    "compiled_sql": "sql",
+    "dag_code": "python",
+}
+
+
+def normalize_artifact(content: str, kind: str = "text") -> str:
+    """Normalize an artifact so insignificant whitespace differences compare equal.
+
+    Only whitespace that cannot change the artifact's meaning is normalized:
+
+    - ``sql``: whitespace between tokens collapses to one space; string
+      literals, quoted identifiers and comments are left untouched.
+    - ``python`` and ``text`` (schemas, YAML): trailing whitespace and blank
+      lines are dropped; indentation and everything else is kept.
+
+    Args:
+        content: Raw artifact contents
+        kind: ``sql``, ``python`` or ``text``
+
+    Returns:
+        Normalized artifact
+    """
+    if kind == "sql":
+        parts = []
+        for statement in sqlparse.parse(content):
+            for token in statement.flatten():
+                if not token.is_whitespace:
+                    parts.append(token.value)
+                elif parts and parts[-1] != " ":
+                    parts.append(" ")
+        return "".join(parts).strip()
+    return "\n".join(line.rstrip() for line in content.splitlines() if line.strip())
+
+
+def coalescing_key(
+    model: str, template: str, fields: Dict[str, str]
+) -> Tuple[str, str, str]:
+    """Build the single-flight key for a generation request.
+
+    Args:
+        model: Model the request will be sent to
+        template: Prompt template used for the request
+        fields: Values substituted into the template (the artifact),
+            normalized according to ``FIELD_KINDS``
+
+    Returns:
+        Hashable key identifying equivalent requests
+    """
+    artifact = "\0".join(
+        f"{name}={normalize_artifact(str(value), FIELD_KINDS.get(name, 'text'))}"
+        for name, value in sorted(fields.items())
+    )
+    template_digest = hashlib.sha256(template.encode("utf-8")).hexdigest()
+    artifact_digest = hashlib.sha256(artifact.encode("utf-8")).hexdigest()
+    return model, template_digest, artifact_digest
+
+
+class _Call:
+    """A generation that is currently in flight."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key.
+
+    The first caller for a key runs the function; callers that arrive while it
+    is running block and receive the same result (or exception). Once the call
+    completes the key is forgotten, so this is not a cache.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run ``fn`` once per concurrent ``key`` and fan the result out.
+
+        Args:
+            key: Identity of the request
+            fn: Function producing the result
+
+        Returns:
+            Result of ``fn`` (possibly computed by another caller)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def in_flight(self) -> int:
+        """Return the number of distinct calls currently running."""
+        with self._lock:
+            return len(self._calls)
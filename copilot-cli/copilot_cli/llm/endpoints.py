@@ -0,0 +1,210 @@
+"""Load balancing across multiple Ollama endpoints."""
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+import ollama
+from rich.console import Console
+
+console = Console()
+
+# Seconds between /api/tags refreshes per endpoint
+MODEL_REFRESH_INTERVAL = 60.0
+# Consecutive failures before an endpoint is ejected
+EJECT_AFTER_FAILURES = 3
+# Seconds an ejected endpoint is kept out of rotation
+EJECT_SECONDS = 30.0
+# Seconds to wait for /api/tags before counting the endpoint as failed
+LIST_TIMEOUT = 5.0
+
+
+class NoEndpointAvailable(RuntimeError):
+    """Raised when no endpoint in the pool can serve a model."""
+
+
+class Endpoint:
+    """One Ollama server and its routing state."""
+
+    def __init__(self, url: str):
+        """Initialize the endpoint.
+
+        Args:
+            url: Ollama base URL
+        """
+        self.url = url
+        self.outstanding = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.models: Optional[Set[str]] = None
+        self.refreshed_at = 0.0
+        self.refresh_lock = threading.Lock()
+        # Bounded so a blackholed server cannot stall acquire() forever
+        self.client = ollama.Client(host=url, timeout=LIST_TIMEOUT)
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the endpoint is currently in rotation."""
+        return time.monotonic() >= self.ejected_until
+
+    def serves(self, model: str) -> bool:
+        """Whether the endpoint may have the model.
+
+        Endpoints whose /api/tags has not been read yet are given the benefit
+        of the doubt.
+        """
+        if self.models is None:
+            return True
+        return model in self.models or f"{model}:latest" in self.models
+
+
+class EndpointPool:
+    """Route requests across Ollama endpoints.
+
+    Requests go to the endpoint with the fewest outstanding requests among
+    those that have the model pulled (learned from /api/tags). Endpoints that
+    fail repeatedly are ejected for a while, then given another chance. A
+    single-endpoint pool sends everything to its endpoint, like a plain client.
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        refresh_interval: float = MODEL_REFRESH_INTERVAL,
+        eject_after: int = EJECT_AFTER_FAILURES,
+        eject_seconds: float = EJECT_SECONDS,
+    ):
+        """Initialize the pool.
+
+        Args:
+            urls: Ollama base URLs
+            refresh_interval: Seconds between model list refreshes
+            eject_after: Consecutive failures before ejection
+            eject_seconds: Seconds an ejected endpoint stays out of rotation
+        """
+        if not urls:
+            raise ValueError("At least one Ollama endpoint is required")
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.refresh_interval = refresh_interval
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, base_url: Optional[str] = None) -> "EndpointPool":
+        """Build a pool from a base URL or the environment.
+
+        ``base_url`` and ``OLLAMA_BASE_URL`` may hold a comma-separated list.
+
+        Args:
+            base_url: Explicit base URL(s)
+
+        Returns:
+            Endpoint pool
+        """
+        value = base_url or os.getenv("OLLAMA_BASE_URL") or "http://localhost:11434"
+        return cls([url.strip() for url in value.split(",") if url.strip()])
+
+    def list_models(self, endpoint: Endpoint) -> List[Dict[str, Any]]:
+        """Fetch an endpoint's model list from /api/tags.
+
+        Args:
+            endpoint: Endpoint to query
+
+        Returns:
+            Models reported by the endpoint
+        """
+        models: List[Dict[str, Any]] = endpoint.client.list().get("models", [])
+        endpoint.models = {m["name"] for m in models}
+        endpoint.refreshed_at = time.monotonic()
+        return models
+
+    def _refresh(self, endpoint: Endpoint) -> None:
+        """Refresh an endpoint's model list if it is stale.
+
+        A failed or timed-out refresh keeps the last known list, counts as a
+        failure of the endpoint and is retried on the next ``acquire``.
+        """
+        if time.monotonic() - endpoint.refreshed_at < self.refresh_interval:
+            return
+        if not endpoint.refresh_lock.acquire(blocking=False):
+            return  # another thread is refreshing it
+        try:
+            self.list_models(endpoint)
+        except Exception as e:
+            console.print(
+                f"[yellow]Could not list models on {endpoint.url}: {e}[/yellow]"
+            )
+            with self._lock:
+                self._record(endpoint, failed=True)
+        finally:
+            endpoint.refresh_lock.release()
+
+    def acquire(self, model: str) -> Endpoint:
+        """Pick an endpoint for a request and count it as outstanding.
+
+        Args:
+            model: Model the request needs
+
+        Returns:
+            Endpoint to send the request to; pass it to ``release`` afterwards
+
+        Raises:
+            NoEndpointAvailable: If no endpoint has the model
+        """
+        if len(self.endpoints) == 1:
+            with self._lock:
+                endpoint = self.endpoints[0]
+                endpoint.outstanding += 1
+                return endpoint
+
+        for endpoint in self.endpoints:
+            if endpoint.healthy:
+                self._refresh(endpoint)
+
+        with self._lock:
+            serving = [e for e in self.endpoints if e.serves(model)]
+            candidates = [e for e in serving if e.healthy]
+            if not candidates and serving:
+                # Every endpoint with the model is ejected: probe the one
+                # that will be readmitted first
+                candidates = [min(serving, key=lambda e: e.ejected_until)]
+            if not candidates:
+                raise NoEndpointAvailable(
+                    f"Model {model} is not available on any Ollama endpoint"
+                )
+            endpoint = min(candidates, key=lambda e: e.outstanding)
+            endpoint.outstanding += 1
+            return endpoint
+
+    def release(self, endpoint: Endpoint, failed: Optional[bool] = False) -> None:
+        """Finish a request and update the endpoint's health.
+
+        Args:
+            endpoint: Endpoint returned by ``acquire``
+            failed: Whether the request failed at the endpoint; None when it
+                was cancelled, which leaves the failure streak untouched
+        """
+        with self._lock:
+            endpoint.outstanding -= 1
+            if failed is not None:
+                self._record(endpoint, failed)
+
+    def _record(self, endpoint: Endpoint, failed: bool) -> None:
+        """Track consecutive failures and eject unhealthy endpoints."""
+        if not failed:
+            endpoint.failures = 0
+            return
+        endpoint.failures += 1
+        if endpoint.failures < self.eject_after or len(self.endpoints) == 1:
+            # A lone endpoint has nowhere to fail over to
+            return
+        if endpoint.healthy:
+            console.print(
+                f"[yellow]Ejected Ollama endpoint {endpoint.url} for "
+                f"{self.eject_seconds:g}s after repeated failures[/yellow]"
+            )
+        endpoint.ejected_until = time.monotonic() + self.eject_seconds
+        # One more failure after readmission ejects it again
+        endpoint.failures = self.eject_after - 1
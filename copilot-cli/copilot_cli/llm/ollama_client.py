@@ -1,87 +1,385 @@
 """Ollama client integration for the Data Engineering Copilot."""
 
+import math
 import os
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 import ollama
 from langchain.llms import Ollama
 from rich.console import Console
 
+from copilot_cli.llm.coalescing import SingleFlight, coalescing_key
+from copilot_cli.llm.endpoints import EndpointPool
+
 console = Console()
 
 
+class GenerationCancelled(Exception):
+    """Raised when an in-flight generation is cancelled by the caller."""
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a generation does not finish before its deadline."""
+
+
+# Latency samples kept per model for hedging decisions
+LATENCY_HISTORY = 100
+# Samples required before hedging is attempted
+MIN_HEDGE_SAMPLES = 5
+# How often waiting callers check for cancellation (seconds)
+_POLL_INTERVAL = 0.05
+
+
+def _env_float(name: str) -> Optional[float]:
+    """Read a positive float from the environment, or None if unset."""
+    value = os.getenv(name)
+    if not value:
+        return None
+    number = float(value)
+    return number if number > 0 else None
+
+
+class _Attempt:
+    """One streaming generation running in a background thread."""
+
+    def __init__(self, model: str, finished: threading.Event):
+        """Initialize the attempt.
+
+        Args:
+            model: Model the attempt is sent to
+            finished: Event shared by sibling attempts, set when any finishes
+        """
+        self.model = model
+        self.cancel = threading.Event()
+        self.done = threading.Event()
+        self.started = time.monotonic()
+        self.elapsed: Optional[float] = None
+        self.result: Optional[str] = None
+        self.error: Optional[BaseException] = None
+        self._finished = finished
+
+    def run(self, stream: Callable[[threading.Event], str]) -> None:
+        """Run the generation and record its outcome."""
+        try:
+            self.result = stream(self.cancel)
+        except BaseException as e:
+            self.error = e
+        finally:
+            self.elapsed = time.monotonic() - self.started
+            self.done.set()
+            self._finished.set()
+
+
 class OllamaClient:
     """Client for interacting with Ollama models."""
 
-    def __init__(self, model: Optional[str] = None, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        hedge_percentile: Optional[float] = None,
+    ):
         """Initialize the Ollama client.
         
         Args:
             model: Model name to use (defaults to env var OLLAMA_MODEL)
-            base_url: Ollama base URL (defaults to env var OLLAMA_BASE_URL)
+            base_url: Ollama base URL, or a comma-separated list of URLs to
+                load balance across (defaults to env var OLLAMA_BASE_URL)
+            timeout: Per-request deadline in seconds (defaults to env var
+                OLLAMA_TIMEOUT; no deadline when unset)
+            hedge_percentile: Launch the fallback model in parallel once the
+                primary exceeds this latency percentile, e.g. 95 (defaults to
+                env var OLLAMA_HEDGE_PERCENTILE; no hedging when unset)
         """
-        self.model = model or os.getenv("OLLAMA_MODEL", "codellama:7b")
+        self.model: str = model or os.getenv("OLLAMA_MODEL") or "codellama:7b"
         self.fallback_model = os.getenv("OLLAMA_FALLBACK_MODEL", "mistral:7b")
-        self.base_url = base_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        self.pool = EndpointPool.from_env(base_url)
+        self.base_url = self.pool.endpoints[0].url
+        self.timeout = timeout if timeout is not None else _env_float("OLLAMA_TIMEOUT")
+        self.hedge_percentile = (
+            hedge_percentile
+            if hedge_percentile is not None
+            else _env_float("OLLAMA_HEDGE_PERCENTILE")
+        )
         
         # Configure ollama client
         ollama.set_host(self.base_url)
         
         # Initialize LangChain Ollama
-        self.llm = Ollama(
-            model=self.model,
-            base_url=self.base_url,
-            temperature=0.1,
-        )
+        self.llm = self._create_llm(self.model, self.base_url)
+        self._llms: Dict[Tuple[str, str], Ollama] = {(self.base_url, self.model): self.llm}
+
+        # Concurrent identical requests share a single generation
+        self._inflight = SingleFlight()
+
+        # Recent successful latencies per model, used to decide when to hedge
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._latency_lock = threading.Lock()
         
         console.print(f"[green]Initialized Ollama client with model: {self.model}[/green]")
 
-    def generate(self, prompt: str, model: Optional[str] = None) -> str:
+    def _create_llm(self, model: str, base_url: str) -> Ollama:
+        """Create a LangChain Ollama instance for a model on an endpoint."""
+        return Ollama(
+            model=model,
+            base_url=base_url,
+            temperature=0.1,
+            # Bounds each socket read so a hung server cannot pin a thread forever
+            timeout=int(math.ceil(self.timeout)) if self.timeout else None,
+        )
+
+    def _get_llm(self, model: str, base_url: str) -> Ollama:
+        """Return a cached LangChain Ollama instance for a model on an endpoint."""
+        key = (base_url, model)
+        if key not in self._llms:
+            self._llms[key] = self._create_llm(model, base_url)
+        return self._llms[key]
+
+    def generate(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        cancel: Optional[threading.Event] = None,
+        deadline: Optional[float] = None,
+        info: Optional[Dict[str, Any]] = None,
+    ) -> str:
         """Generate text using the specified model.
+
+        The fallback model is tried when the primary fails. With hedging
+        enabled it is also launched in parallel once the primary runs longer
+        than its recent latency percentile; whichever finishes first wins and
+        the other is cancelled.
         
         Args:
             prompt: The prompt to send to the model
             model: Optional model override
+            cancel: Optional event; when set, the response stream is closed
+                and GenerationCancelled is raised
+            deadline: Absolute ``time.monotonic()`` deadline (defaults to now
+                plus the client timeout); DeadlineExceeded is raised when it
+                passes
+            info: Optional dict that receives the ``model`` that produced the
+                response and its ``generation_seconds``
             
         Returns:
             Generated text response
         """
+        primary = model or self.model
+        if deadline is None and self.timeout:
+            deadline = time.monotonic() + self.timeout
+        can_fall_back = primary != self.fallback_model
+
+        finished = threading.Event()
+        attempts = [self._start_attempt(primary, prompt, finished)]
+        hedge_delay = self._hedge_delay(primary) if can_fall_back else None
+        fallback_started = False
+
         try:
-            if model:
-                # Use specific model for this request
-                temp_llm = Ollama(
-                    model=model,
-                    base_url=self.base_url,
-                    temperature=0.1,
-                )
-                response = temp_llm.invoke(prompt)
-            else:
-                response = self.llm.invoke(prompt)
-            
-            return response.strip()
-            
-        except Exception as e:
-            console.print(f"[red]Error with model {model or self.model}: {e}[/red]")
+            while True:
+                finished.clear()
+                for attempt in [a for a in attempts if a.done.is_set()]:
+                    attempts.remove(attempt)
+                    if attempt.error is None:
+                        self._record_latency(attempt.model, attempt.elapsed or 0.0)
+                        # A cancelled loser took at least this long; without
+                        # these samples only fast responses are remembered and
+                        # the hedge delay keeps shrinking
+                        for loser in attempts:
+                            self._record_latency(
+                                loser.model, time.monotonic() - loser.started
+                            )
+                        if info is not None:
+                            info["model"] = attempt.model
+                            info["generation_seconds"] = attempt.elapsed
+                        return (attempt.result or "").strip()
+
+                    console.print(f"[red]Error with model {attempt.model}: {attempt.error}[/red]")
+                    if not attempts and can_fall_back and not fallback_started:
+                        console.print(f"[yellow]Trying fallback model: {self.fallback_model}[/yellow]")
+                        attempts.append(
+                            self._start_attempt(self.fallback_model, prompt, finished)
+                        )
+                        fallback_started = True
+                    elif not attempts:
+                        raise attempt.error
+
+                now = time.monotonic()
+                if cancel is not None and cancel.is_set():
+                    raise GenerationCancelled("Generation cancelled")
+                if deadline is not None and now >= deadline:
+                    raise DeadlineExceeded(
+                        f"Generation with model {primary} exceeded its deadline"
+                    )
+
+                hedge_at = None
+                if hedge_delay is not None and not fallback_started:
+                    hedge_at = attempts[0].started + hedge_delay
+                    if now >= hedge_at:
+                        console.print(
+                            f"[yellow]Model {primary} slower than p{self.hedge_percentile:g} "
+                            f"({hedge_delay:.1f}s); hedging with {self.fallback_model}[/yellow]"
+                        )
+                        attempts.append(
+                            self._start_attempt(self.fallback_model, prompt, finished)
+                        )
+                        fallback_started = True
+                        continue
+
+                wake = [now + _POLL_INTERVAL] if cancel is not None else []
+                wake += [t for t in (deadline, hedge_at) if t is not None]
+                finished.wait(timeout=max(min(wake) - now, 0) if wake else None)
+        finally:
+            # Closes the HTTP stream of every attempt still running
+            for attempt in attempts:
+                attempt.cancel.set()
+
+    def _start_attempt(
+        self, model: str, prompt: str, finished: threading.Event
+    ) -> _Attempt:
+        """Start a streaming generation in a daemon thread."""
+        attempt = _Attempt(model, finished)
+        thread = threading.Thread(
+            target=attempt.run,
+            args=(lambda cancel: self._stream_from_pool(model, prompt, cancel),),
+            daemon=True,
+        )
+        thread.start()
+        return attempt
+
+    def _stream_from_pool(
+        self, model: str, prompt: str, cancel: threading.Event
+    ) -> str:
+        """Stream a response from the least busy endpoint serving the model."""
+        endpoint = self.pool.acquire(model)
+        failed: Optional[bool] = True
+        try:
+            text = self._stream(self._get_llm(model, endpoint.url), prompt, cancel)
+            failed = False
+            return text
+        except GenerationCancelled:
+            # Cancellation says nothing about the endpoint's health
+            failed = None
+            raise
+        finally:
+            self.pool.release(endpoint, failed)
+
+    def _stream(self, llm: Ollama, prompt: str, cancel: threading.Event) -> str:
+        """Stream a response, stopping as soon as ``cancel`` is set.
+        
+        Args:
+            llm: LangChain Ollama instance
+            prompt: The prompt to send to the model
+            cancel: Cancellation event
             
-            # Try fallback model
-            if model != self.fallback_model:
-                console.print(f"[yellow]Trying fallback model: {self.fallback_model}[/yellow]")
-                return self.generate(prompt, self.fallback_model)
+        Returns:
+            Raw generated text
+        """
+        if cancel.is_set():
+            raise GenerationCancelled("Generation cancelled before it started")
+
+        chunks = []
+        stream = llm.stream(prompt)
+        try:
+            for chunk in stream:
+                if cancel.is_set():
+                    raise GenerationCancelled("Generation cancelled")
+                chunks.append(chunk)
+        finally:
+            # Closing the generator closes the underlying HTTP stream
+            stream.close()
+        return "".join(chunks)
+
+    def _record_latency(self, model: str, seconds: float) -> None:
+        """Remember a generation latency (or a lower bound on it) for a model."""
+        with self._latency_lock:
+            history = self._latencies.setdefault(model, deque(maxlen=LATENCY_HISTORY))
+            history.append(seconds)
+
+    def _hedge_delay(self, model: str) -> Optional[float]:
+        """Return how long to wait before hedging, or None to not hedge."""
+        if not self.hedge_percentile:
+            return None
+        with self._latency_lock:
+            history = sorted(self._latencies.get(model, ()))
+        if len(history) < MIN_HEDGE_SAMPLES:
+            return None
+        index = min(len(history) - 1, int(len(history) * self.hedge_percentile / 100))
+        return history[index]
+
+    def generate_from_template(
+        self,
+        template: str,
+        model: Optional[str] = None,
+        cancel: Optional[threading.Event] = None,
+        deadline: Optional[float] = None,
+        info: Optional[Dict[str, Any]] = None,
+        **fields: str,
+    ) -> str:
+        """Render a prompt template and generate, coalescing duplicate requests.
+
+        Concurrent calls with the same model, template and layout-normalized
+        field values share one in-flight generation and all receive its result.
+        Cancellable requests are not coalesced, since cancelling a shared
+        generation would fail every caller waiting on it.
+        
+        Args:
+            template: Prompt template (e.g. SQL_OPTIMIZATION_PROMPT)
+            model: Optional model override
+            cancel: Optional cancellation event
+            deadline: Optional absolute ``time.monotonic()`` deadline; callers
+                joining a coalesced generation share the first caller's deadline
+            info: Optional dict filled as for ``generate``, plus ``coalesced``
+                (whether another caller's generation was shared)
+            **fields: Values substituted into the template
             
-            raise
+        Returns:
+            Generated text response
+        """
+        prompt = template.format(**fields)
+        if cancel is not None:
+            if info is not None:
+                info["coalesced"] = False
+            return self.generate(prompt, model, cancel, deadline, info)
+
+        own: Dict[str, Any] = {}
+
+        def run() -> Tuple[str, Dict[str, Any]]:
+            return self.generate(prompt, model, deadline=deadline, info=own), own
+
+        key = coalescing_key(model or self.model, template, fields)
+        response: str
+        details: Dict[str, Any]
+        response, details = self._inflight.do(key, run)
+        if info is not None:
+            info.update(details)
+            info["coalesced"] = details is not own
+        return response
+
+    @property
+    def coalesced(self) -> int:
+        """Number of requests served by another caller's in-flight generation."""
+        return self._inflight.coalesced
 
     def list_models(self) -> List[Dict[str, Any]]:
-        """List available models.
+        """List available models across all healthy endpoints.
         
         Returns:
             List of available models
         """
-        try:
-            models = ollama.list()
-            return models.get("models", [])
-        except Exception as e:
-            console.print(f"[red]Error listing models: {e}[/red]")
-            return []
+        models: Dict[str, Dict[str, Any]] = {}
+        for endpoint in self.pool.endpoints:
+            if not endpoint.healthy:
+                continue
+            try:
+                for m in self.pool.list_models(endpoint):
+                    models.setdefault(m["name"], m)
+            except Exception as e:
+                console.print(f"[red]Error listing models on {endpoint.url}: {e}[/red]")
+        return list(models.values())
 
     def is_model_available(self, model: str) -> bool:
         """Check if a model is available.
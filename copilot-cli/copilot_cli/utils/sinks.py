@@ -0,0 +1,163 @@
+"""Streaming output of analysis results as they complete."""
+
+import contextlib
+import json
+import queue
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, TextIO, Tuple
+
+from copilot_cli.llm.analysis import AnalysisResult
+from copilot_cli.utils.file_utils import save_file
+
+# Per-artifact files queued for the background writer before emit() blocks
+MAX_PENDING_FILES = 64
+
+
+def result_record(result: AnalysisResult, command: str) -> Dict[str, Any]:
+    """Build the NDJSON record for a completed artifact.
+
+    Args:
+        result: Analysis result
+        command: CLI command that produced it (batch, watch, dbt review, ...)
+
+    Returns:
+        JSON-serializable record
+    """
+    return {
+        "path": result.path,
+        "command": command,
+        "analysis": result.analysis,
+        "model": result.model,
+        "status": "ok" if result.ok else "error",
+        "error": str(result.error) if result.error else None,
+        "timings": result.timings,
+        "cache": result.cache,
+        "sections": result.sections,
+    }
+
+
+class ResultSink:
+    """Emit one JSON line per completed artifact while a run is in progress.
+
+    Records are written and flushed as soon as each result arrives and nothing
+    is retained afterwards, so memory does not grow with the size of a run.
+    Full responses can also be saved as one Markdown file per artifact; those
+    writes happen on a background thread behind a bounded queue.
+
+    Use as a context manager. When records go to stdout, console messages are
+    redirected to stderr for the duration so the stream stays valid NDJSON.
+    """
+
+    def __init__(
+        self,
+        command: str,
+        output: Optional[str] = None,
+        save_dir: Optional[str] = None,
+        root: Optional[str] = None,
+        max_pending: int = MAX_PENDING_FILES,
+    ):
+        """Initialize the sink.
+
+        Args:
+            command: CLI command recorded in every record
+            output: ``-`` for stdout, a file path to append to, or None to
+                skip records
+            save_dir: Directory for per-artifact response files, or None
+            root: Directory artifact paths are made relative to under
+                ``save_dir``
+            max_pending: Files queued for writing before ``emit`` blocks
+        """
+        self.command = command
+        self.output = output
+        self.save_dir = Path(save_dir) if save_dir else None
+        self.root = Path(root) if root else None
+        self.emitted = 0
+        self.failed_writes = 0
+        self._stream: Optional[TextIO] = None
+        self._lock = threading.Lock()
+        self._exit_stack = contextlib.ExitStack()
+        self._files: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue(
+            maxsize=max(1, max_pending)
+        )
+        self._writer: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "ResultSink":
+        if self.output == "-":
+            self._stream = sys.stdout
+            self._exit_stack.enter_context(contextlib.redirect_stdout(sys.stderr))
+        elif self.output:
+            Path(self.output).parent.mkdir(parents=True, exist_ok=True)
+            self._stream = self._exit_stack.enter_context(
+                open(self.output, "a", encoding="utf-8")
+            )
+        if self.save_dir is not None:
+            self._writer = threading.Thread(target=self._write_files, daemon=True)
+            self._writer.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def emit(self, result: AnalysisResult) -> None:
+        """Write a result's record and queue its response file.
+
+        Safe to call from several threads.
+
+        Args:
+            result: Completed analysis result
+        """
+        if self._stream is not None:
+            line = json.dumps(result_record(result, self.command))
+            with self._lock:
+                self._stream.write(line + "\n")
+                self._stream.flush()
+        with self._lock:
+            self.emitted += 1
+        if self._writer is not None and result.ok:
+            # Blocks when the writer falls behind, bounding queued responses
+            self._files.put((self.artifact_path(result), result.response or ""))
+
+    def artifact_path(self, result: AnalysisResult) -> str:
+        """Path of the response file saved for a result.
+
+        The path always stays under ``save_dir``: artifacts outside ``root``
+        (or absolute or ``..`` paths without a root) are saved by file name.
+
+        Raises:
+            ValueError: If the sink has no ``save_dir``
+        """
+        if self.save_dir is None:
+            raise ValueError("ResultSink was created without a save_dir")
+        path = Path(result.path)
+        if self.root is not None:
+            try:
+                path = path.resolve().relative_to(self.root.resolve())
+            except ValueError:
+                path = Path(path.name)
+        elif path.is_absolute() or ".." in path.parts:
+            path = Path(path.name)
+        return str(self.save_dir / f"{path}.{result.analysis}.md")
+
+    def _write_files(self) -> None:
+        """Save queued response files until the sentinel arrives."""
+        while True:
+            item = self._files.get()
+            if item is None:
+                return
+            file_path, content = item
+            try:
+                save_file(content, file_path)
+            except Exception:
+                # save_file already reported the error
+                self.failed_writes += 1
+
+    def close(self) -> None:
+        """Finish pending file writes and close the record stream."""
+        if self._writer is not None:
+            self._files.put(None)
+            self._writer.join()
+            self._writer = None
+        self._exit_stack.close()
+        self._stream = None
@@ -0,0 +1,201 @@
+"""Debounced directory watching for the Data Engineering Copilot."""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from rich.console import Console
+
+try:
+    from watchdog.events import FileSystemEvent, FileSystemEventHandler
+    from watchdog.observers import Observer
+    from watchdog.observers.api import BaseObserver
+
+    WATCHDOG_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on optional extra
+    WATCHDOG_AVAILABLE = False
+
+console = Console()
+
+_CHANGE_EVENTS = ("created", "modified", "moved")
+
+# Directories never watched, in addition to hidden ones (.git, .venv,
+# .copilot_cache, ...)
+IGNORED_DIRS = ("__pycache__", "node_modules", "site-packages", "venv", "env")
+
+
+def _ignored_name(name: str) -> bool:
+    """Check whether a file or directory name is never watched."""
+    return name.startswith(".") or name in IGNORED_DIRS
+
+
+class DirectoryWatcher:
+    """Watch a directory and report files once they stop changing.
+
+    Uses watchdog (inotify on Linux, FSEvents on macOS) when it is installed and
+    falls back to polling file modification times otherwise. Rapid successive
+    saves of the same file are debounced into a single callback. Hidden files
+    and directories, virtualenvs and caches are skipped by both backends.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        callback: Callable[[str], None],
+        extensions: Optional[List[str]] = None,
+        debounce: float = 0.5,
+        poll_interval: float = 1.0,
+        use_polling: bool = False,
+        exclude: Optional[List[str]] = None,
+    ):
+        """Initialize the watcher.
+
+        Args:
+            directory: Directory to watch recursively
+            callback: Called with the path of each changed file
+            extensions: Only report files with these extensions
+            debounce: Seconds a file must be quiet before it is reported
+            poll_interval: Seconds between scans when polling
+            use_polling: Force the polling backend
+            exclude: Files or directories to ignore (e.g. the command's own
+                output files)
+        """
+        self.directory = Path(directory)
+        self._root = self.directory.resolve()
+        self.exclude = [Path(p).resolve() for p in exclude or []]
+        self.callback = callback
+        self.extensions = extensions
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_polling = use_polling or not WATCHDOG_AVAILABLE
+
+        self._pending: Dict[str, float] = {}
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._observer: Optional["BaseObserver"] = None
+
+    @property
+    def backend(self) -> str:
+        """Name of the change-detection backend in use."""
+        return "polling" if self.use_polling else "watchdog"
+
+    def _matches(self, file_path: str) -> bool:
+        """Check whether a path should be reported."""
+        path = Path(file_path).resolve()
+        try:
+            parts = path.relative_to(self._root).parts
+        except ValueError:
+            parts = path.parts[-1:]
+        if any(_ignored_name(part) for part in parts):
+            return False
+        if any(path == e or e in path.parents for e in self.exclude):
+            return False
+        if self.extensions is None:
+            return True
+        return path.suffix.lower() in self.extensions
+
+    def notify(self, file_path: str) -> None:
+        """Record a change, (re)starting the file's debounce window.
+
+        Args:
+            file_path: Path of the changed file
+        """
+        if not self._matches(file_path):
+            return
+        with self._condition:
+            self._pending[file_path] = time.monotonic() + self.debounce
+            self._condition.notify()
+
+    def _dispatch_loop(self) -> None:
+        """Fire callbacks for files whose debounce window has elapsed."""
+        while not self._stopped.is_set():
+            with self._condition:
+                now = time.monotonic()
+                ready = [p for p, due in self._pending.items() if due <= now]
+                for file_path in ready:
+                    del self._pending[file_path]
+                if not ready:
+                    timeout = min(self._pending.values(), default=now + 1.0) - now
+                    self._condition.wait(timeout=max(timeout, 0.01))
+                    continue
+
+            for file_path in ready:
+                try:
+                    self.callback(file_path)
+                except Exception as e:
+                    console.print(
+                        f"[red]Error handling change to {file_path}: {e}[/red]"
+                    )
+
+    def _snapshot(self) -> Dict[str, float]:
+        """Return modification times for all watched files."""
+        mtimes = {}
+        for dirpath, dirnames, filenames in os.walk(self.directory):
+            # Prune ignored directories so they are never scanned
+            dirnames[:] = [
+                d
+                for d in dirnames
+                if not _ignored_name(d)
+                and (Path(dirpath) / d).resolve() not in self.exclude
+            ]
+            for name in filenames:
+                file_path = os.path.join(dirpath, name)
+                if not self._matches(file_path):
+                    continue
+                try:
+                    mtimes[file_path] = os.stat(file_path).st_mtime
+                except OSError:
+                    continue
+        return mtimes
+
+    def _poll_loop(self) -> None:
+        """Detect changes by comparing modification-time snapshots."""
+        previous = self._snapshot()
+        while not self._stopped.wait(self.poll_interval):
+            current = self._snapshot()
+            for file_path, mtime in current.items():
+                if previous.get(file_path) != mtime:
+                    self.notify(file_path)
+            previous = current
+
+    def start(self) -> None:
+        """Start watching in background threads."""
+        self._stopped.clear()
+        dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+        self._threads = [dispatcher]
+
+        if self.use_polling:
+            self._threads.append(threading.Thread(target=self._poll_loop, daemon=True))
+        else:
+            watcher = self
+
+            class _Handler(FileSystemEventHandler):
+                def on_any_event(self, event: FileSystemEvent) -> None:
+                    # Ignore opened/closed events: analyzing a file reads it
+                    if event.is_directory or event.event_type not in _CHANGE_EVENTS:
+                        return
+                    target = getattr(event, "dest_path", "") or event.src_path
+                    watcher.notify(str(target))
+
+            self._observer = Observer()
+            self._observer.schedule(_Handler(), str(self.directory), recursive=True)
+            self._observer.start()
+
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """Stop watching and wait for background threads to exit."""
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
@@ -63,3 +63,33 @@ Focus on:
 - Maintainability
 - Business value
 """
+
+DBT_MODEL_REVIEW_PROMPT = """You are an expert dbt reviewer. Review the following compiled dbt model.
+
+Model Name: {model_name}
+
+Compiled SQL:
+{compiled_sql}
+
+Findings from upstream models:
+{upstream_findings}
+
+Please provide:
+1. **Summary**: What does this model produce?
+2. **Issues**: Correctness, performance or data quality problems in this model
+3. **Upstream Impact**: How the upstream findings affect this model
+4. **Recommendations**: Specific changes to the model
+
+Format your response as:
+## Summary
+[One or two sentences]
+
+## Issues
+[Issues found]
+
+## Upstream Impact
+[Effect of upstream findings, or "None"]
+
+## Recommendations
+[Recommended changes]
+"""
@@ -0,0 +1,165 @@
+"""Tests for request coalescing."""
+
+import threading
+import time
+
+import pytest
+
+from copilot_cli.llm.coalescing import SingleFlight, coalescing_key, normalize_artifact
+
+
+def test_normalize_sql_collapses_whitespace_between_tokens():
+    """Test that SQL layout whitespace collapses and ends are stripped."""
+    assert normalize_artifact("  SELECT *\n\tFROM  t \n", "sql") == "SELECT * FROM t"
+
+
+def test_normalize_python_keeps_indentation():
+    """Test that Python only loses trailing whitespace and blank lines."""
+    source = "if x:  \n\n    a()\n    b()\n\n"
+    assert normalize_artifact(source, "python") == "if x:\n    a()\n    b()"
+
+
+def test_coalescing_key_ignores_formatting():
+    """Test that formatting-only differences produce the same key."""
+    a = coalescing_key(
+        "codellama:7b", "T {sql_query}", {"sql_query": "SELECT *\nFROM t"}
+    )
+    b = coalescing_key(
+        "codellama:7b", "T {sql_query}", {"sql_query": "SELECT *   FROM t  "}
+    )
+    assert a == b
+    c = coalescing_key("codellama:7b", "T {dag_code}", {"dag_code": "a()\n\nb()  \n"})
+    d = coalescing_key("codellama:7b", "T {dag_code}", {"dag_code": "a()\nb()"})
+    assert c == d
+
+
+def test_coalescing_key_keeps_sql_literals_apart():
+    """Test that whitespace inside SQL string literals is significant."""
+    a = coalescing_key(
+        "codellama:7b", "T {sql_query}", {"sql_query": "WHERE name = 'a  b'"}
+    )
+    b = coalescing_key(
+        "codellama:7b", "T {sql_query}", {"sql_query": "WHERE name = 'a b'"}
+    )
+    assert a != b
+
+
+def test_coalescing_key_keeps_python_indentation_apart():
+    """Test that indentation changes in DAG code are significant."""
+    a = coalescing_key(
+        "codellama:7b", "T {dag_code}", {"dag_code": "if x:\n    a()\nb()"}
+    )
+    b = coalescing_key(
+        "codellama:7b", "T {dag_code}", {"dag_code": "if x:\n    a()\n    b()"}
+    )
+    assert a != b
+
+
+def test_coalescing_key_keeps_schema_indentation_apart():
+    """Test that other artifacts (YAML schemas) keep their indentation."""
+    a = coalescing_key("m", "T {schema}", {"schema": "a:\n  b: 1\nc: 2"})
+    b = coalescing_key("m", "T {schema}", {"schema": "a:\n  b: 1\n  c: 2"})
+    assert a != b
+
+
+def test_coalescing_key_distinguishes_model_template_and_artifact():
+    """Test that model, template and artifact all change the key."""
+    base = coalescing_key("codellama:7b", "T {sql}", {"sql": "SELECT 1"})
+    assert coalescing_key("mistral:7b", "T {sql}", {"sql": "SELECT 1"}) != base
+    assert coalescing_key("codellama:7b", "U {sql}", {"sql": "SELECT 1"}) != base
+    assert coalescing_key("codellama:7b", "T {sql}", {"sql": "SELECT 2"}) != base
+
+
+def _wait_until(predicate, timeout=5.0):
+    """Poll until ``predicate`` holds or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert predicate()
+
+
+def _run_concurrently(flight, key, fn, callers):
+    """Call ``flight.do`` from several threads once the leader is running."""
+    results = []
+    errors = []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_single_flight_fans_out_one_call():
+    """Test that concurrent callers share one execution and its result."""
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "result"
+
+    leader, results, _ = _run_concurrently(flight, "k", fn, 1)
+    assert started.wait(5)
+    followers, follower_results, _ = _run_concurrently(flight, "k", fn, 3)
+    _wait_until(lambda: flight.coalesced == 3)
+    release.set()
+    for thread in leader + followers:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results + follower_results == ["result"] * 4
+    assert flight.coalesced == 3
+    assert flight.in_flight() == 0
+
+
+def test_single_flight_propagates_errors_to_waiters():
+    """Test that every caller sees the leader's exception."""
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fn():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("boom")
+
+    leader, _, leader_errors = _run_concurrently(flight, "k", fn, 1)
+    assert started.wait(5)
+    followers, _, follower_errors = _run_concurrently(flight, "k", fn, 2)
+    _wait_until(lambda: flight.coalesced == 2)
+    release.set()
+    for thread in leader + followers:
+        thread.join(5)
+
+    errors = leader_errors + follower_errors
+    assert len(errors) == 3
+    assert all(isinstance(e, RuntimeError) for e in errors)
+
+
+def test_single_flight_is_not_a_cache():
+    """Test that a completed key runs again on the next call."""
+    flight = SingleFlight()
+    calls = []
+    assert flight.do("k", lambda: calls.append(1) or len(calls)) == 1
+    assert flight.do("k", lambda: calls.append(1) or len(calls)) == 2
+    assert flight.coalesced == 0
+
+
+def test_single_flight_keeps_distinct_keys_apart():
+    """Test that different keys never share a result."""
+    flight = SingleFlight()
+    assert flight.do("a", lambda: "a") == "a"
+    assert flight.do("b", lambda: "b") == "b"
+    with pytest.raises(ValueError):
+        flight.do("c", lambda: (_ for _ in ()).throw(ValueError("c")))
+    assert flight.in_flight() == 0
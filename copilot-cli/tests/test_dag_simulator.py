@@ -0,0 +1,183 @@
+"""Tests for static DAG graphs and run simulation."""
+
+from pathlib import Path
+
+import pytest
+
+from copilot_cli.dag.graph import TaskGraph, TaskNode, build_task_graph
+from copilot_cli.dag.simulator import (
+    TaskStats,
+    critical_path,
+    expected_durations,
+    expected_times,
+    serial_chains,
+    simulate,
+    simulate_run,
+    split_task,
+)
+
+CUSTOMER360_DAG = (
+    Path(__file__).parent.parent / "data_pipeline" / "dags" / "customer360_etl.py"
+)
+
+DAG_SOURCE = """
+from datetime import timedelta
+from airflow import DAG
+from airflow.models.baseoperator import chain
+from airflow.operators.empty import EmptyOperator
+
+default_args = {"retries": 2, "retry_delay": timedelta(minutes=1)}
+
+with DAG("example", default_args=default_args, schedule_interval="@daily") as dag:
+    a = EmptyOperator(task_id="a")
+    b = EmptyOperator(task_id="b", retries=0)
+    c = EmptyOperator(task_id="c", retry_delay=30)
+    d = EmptyOperator(task_id="d")
+    e = EmptyOperator(task_id="e")
+
+    a >> [b, c]
+    chain([b, c], d)
+    e << d
+"""
+
+
+def _chain_graph(*task_ids):
+    """Build a linear graph with the given task ids."""
+    graph = TaskGraph()
+    for task_id in task_ids:
+        graph.add_task(TaskNode(task_id))
+    for upstream, downstream in zip(task_ids, task_ids[1:]):
+        graph.add_edge(upstream, downstream)
+    return graph
+
+
+@pytest.fixture
+def customer360():
+    """Task graph of the mock Customer360 DAG."""
+    return build_task_graph(str(CUSTOMER360_DAG))
+
+
+def test_build_task_graph_reads_dependencies_and_retries(tmp_path):
+    """Test >>, <<, lists, chain() and default_args retry fallbacks."""
+    dag_file = tmp_path / "example.py"
+    dag_file.write_text(DAG_SOURCE)
+    graph = build_task_graph(str(dag_file))
+
+    assert graph.dag_id == "example"
+    assert graph.schedule_seconds == 86400
+    assert graph.downstream["a"] == {"b", "c"}
+    assert graph.upstream["d"] == {"b", "c"}
+    assert graph.downstream["d"] == {"e"}
+    assert (graph.tasks["a"].retries, graph.tasks["a"].retry_delay) == (2, 60.0)
+    assert graph.tasks["b"].retries == 0
+    assert graph.tasks["c"].retry_delay == 30.0
+    assert graph.tasks["a"].operator == "EmptyOperator"
+
+
+def test_customer360_graph(customer360):
+    """Test the task graph extracted from the Customer360 DAG."""
+    assert customer360.dag_id == "customer360_etl"
+    assert customer360.schedule_seconds == 3600
+    assert len(customer360.tasks) == 10
+    assert customer360.upstream["clean_events"] == {
+        "ingest_mobile_events",
+        "ingest_web_events",
+        "ingest_crm_data",
+    }
+    assert customer360.tasks["run_dbt_models"].retries == 3
+    assert customer360.tasks["run_dbt_models"].retry_delay == 300.0
+
+
+def test_customer360_simulation_with_default_durations(customer360):
+    """Test critical path, width and wall-clock with 60s per task."""
+    report = simulate(customer360, {})
+
+    assert len(report["critical_path"]) == 7
+    assert report["critical_path"][-3:] == [
+        "generate_analytics",
+        "update_dashboards",
+        "send_notifications",
+    ]
+    assert report["critical_path_seconds"] == 420.0
+    assert report["max_parallel_width"] == 3
+    assert report["wall_clock_seconds"] == 420.0
+    assert report["fits_schedule"] is True
+    assert report["serial_chains"] == [
+        [
+            "run_dbt_models",
+            "run_data_tests",
+            "generate_analytics",
+            "update_dashboards",
+            "send_notifications",
+        ]
+    ]
+
+
+def test_simulate_run_respects_slots(customer360):
+    """Test that a single slot runs every task back to back."""
+    durations = expected_durations(customer360, {})
+    assert simulate_run(customer360, durations, slots=1) == 600.0
+    assert simulate_run(customer360, durations, slots=2) == 480.0
+    assert simulate_run(customer360, durations) == 420.0
+
+
+def test_split_savings_need_free_slots(customer360):
+    """Test that splitting a task saves nothing when no slot is free."""
+    assert simulate(customer360, {}, slots=1)["parallelization_candidates"] == []
+    candidates = simulate(customer360, {})["parallelization_candidates"]
+    assert {c["task_id"] for c in candidates} >= {"run_dbt_models"}
+    assert all(c["saving"] == 30.0 for c in candidates)
+
+
+def test_expected_durations_include_retries():
+    """Test expected attempts 1 + p + ... + p^r and retry delays."""
+    graph = _chain_graph("a")
+    graph.tasks["a"].retries = 2
+    graph.tasks["a"].retry_delay = 10.0
+    durations = expected_durations(graph, {"a": TaskStats([100.0], failure_rate=0.5)})
+    attempts = 1 + 0.5 + 0.25
+    assert durations["a"] == pytest.approx(100.0 * attempts + 10.0 * (attempts - 1))
+
+
+def test_split_task_shards_attempt_time_only():
+    """Test that every shard still waits the full retry delay."""
+    graph = _chain_graph("a", "b", "c")
+    graph.tasks["b"].retries = 1
+    graph.tasks["b"].retry_delay = 40.0
+    stats = {"b": TaskStats([100.0], failure_rate=0.5)}
+    attempt, delay = expected_times(graph, stats)["b"]
+    assert (attempt, delay) == (150.0, 20.0)
+
+    durations = expected_durations(graph, stats)
+    trial, trial_durations = split_task(graph, durations, "b", 2, delay=delay)
+    assert trial_durations["b[0]"] == trial_durations["b[1]"] == 95.0
+    assert trial.upstream["b[1]"] == {"a"}
+    assert trial.downstream["b[0]"] == {"c"}
+
+    (candidate,) = [
+        c
+        for c in simulate(graph, stats)["parallelization_candidates"]
+        if c["task_id"] == "b"
+    ]
+    assert candidate["saving"] == pytest.approx(170.0 - 95.0)
+
+
+def test_critical_path_picks_longest_branch():
+    """Test that the longest of two branches is the critical path."""
+    graph = _chain_graph("start", "slow", "end")
+    graph.add_task(TaskNode("fast"))
+    graph.add_edge("start", "fast")
+    graph.add_edge("fast", "end")
+    durations = {"start": 1.0, "slow": 5.0, "fast": 2.0, "end": 1.0}
+
+    length, path, start = critical_path(graph, durations)
+    assert length == 7.0
+    assert path == ["start", "slow", "end"]
+    assert start["end"] == 6.0
+
+
+def test_serial_chains_respect_min_length():
+    """Test that only linear runs of at least min_length are reported."""
+    graph = _chain_graph("a", "b", "c")
+    assert serial_chains(graph) == [["a", "b", "c"]]
+    assert serial_chains(graph, min_length=4) == []
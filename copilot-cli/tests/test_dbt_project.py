@@ -0,0 +1,152 @@
+"""Tests for local dbt rendering and project compilation."""
+
+import pytest
+
+from copilot_cli.dbt.compiler import find_refs, render_model
+from copilot_cli.dbt.project import DbtProject
+
+MODEL_SQL = """
+{{ config(materialized='incremental', unique_key='customer_id') }}
+{# ranked customers #}
+SELECT c.customer_id, o.total, '{{ var("region") }}' AS region
+FROM {{ ref('stg_customers') }} c
+JOIN {{ ref("my_package", "stg_orders") }} o ON o.customer_id = c.customer_id
+JOIN {{ source('crm', 'accounts') }} a ON a.id = c.account_id
+{% if is_incremental() %}
+WHERE o.updated_at > (SELECT MAX(updated_at) FROM {{ this }})
+{% endif %}
+LIMIT {{ var('row_limit', 100) }}
+"""
+
+
+def _write_models(models_dir, models):
+    """Write model files into a models directory."""
+    models_dir.mkdir(parents=True, exist_ok=True)
+    for name, sql in models.items():
+        (models_dir / f"{name}.sql").write_text(sql)
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    """A small project: stg -> int -> (fct, dim)."""
+    models = tmp_path / "models"
+    _write_models(
+        models,
+        {
+            "stg_events": "SELECT * FROM {{ source('raw', 'events') }}",
+            "int_sessions": "SELECT * FROM {{ ref('stg_events') }}",
+            "fct_activity": "SELECT * FROM {{ ref('int_sessions') }}",
+            "dim_customer": (
+                "SELECT * FROM {{ ref('int_sessions') }} "
+                "JOIN {{ ref('stg_events') }} USING (customer_id)"
+            ),
+        },
+    )
+    return models
+
+
+def test_find_refs_handles_package_refs_and_comments():
+    """Test ref() extraction, including two-argument refs."""
+    source = MODEL_SQL + "{# {{ ref('commented_out') }} #}"
+    assert find_refs(source) == ["stg_customers", "stg_orders"]
+
+
+def test_render_model_expands_jinja():
+    """Test ref, source, var, this, config and is_incremental rendering."""
+    sql, unrendered = render_model(
+        "fct_orders", MODEL_SQL, {"region": "emea"}, schema="analytics"
+    )
+    assert "config" not in sql
+    assert "ranked customers" not in sql
+    assert "FROM analytics.stg_customers c" in sql
+    assert "JOIN analytics.stg_orders o" in sql
+    assert "JOIN crm.accounts a" in sql
+    assert "'emea' AS region" in sql
+    assert "LIMIT 100" in sql
+    # Compiled as a full refresh
+    assert "MAX(updated_at)" not in sql
+    assert unrendered == []
+
+
+def test_render_model_keeps_else_branch_and_reports_unknown_jinja():
+    """Test the full-refresh branch and reporting of unsupported expressions."""
+    source = (
+        "SELECT * FROM {{ this }} "
+        "{% if is_incremental() %}WHERE x > 1{% else %}WHERE 1 = 1{% endif %} "
+        "{{ dbt_utils.star('t') }}"
+    )
+    sql, unrendered = render_model("m", source)
+    assert sql.startswith("SELECT * FROM m WHERE 1 = 1")
+    assert "x > 1" not in sql
+    assert unrendered == ["{{ dbt_utils.star('t') }}"]
+
+
+def test_levels_follow_dependencies(project_dir, tmp_path):
+    """Test that models are grouped after all of their parents."""
+    project = DbtProject(str(project_dir), cache_dir=str(tmp_path / "cache"))
+    assert project.levels() == [
+        ["stg_events"],
+        ["int_sessions"],
+        ["dim_customer", "fct_activity"],
+    ]
+
+
+def test_levels_reject_cycles(tmp_path):
+    """Test that circular refs raise ValueError."""
+    models = tmp_path / "models"
+    _write_models(
+        models,
+        {"a": "SELECT * FROM {{ ref('b') }}", "b": "SELECT * FROM {{ ref('a') }}"},
+    )
+    with pytest.raises(ValueError, match="Circular"):
+        DbtProject(str(models), cache_dir=str(tmp_path / "cache")).levels()
+
+
+def test_compile_reuses_cache(project_dir, tmp_path):
+    """Test that an unchanged project compiles entirely from cache."""
+    cache_dir = str(tmp_path / "cache")
+    first = DbtProject(str(project_dir), cache_dir=cache_dir)
+    compiled = first.compile()
+    assert (first.cache.hits, first.cache.misses) == (0, 4)
+
+    second = DbtProject(str(project_dir), cache_dir=cache_dir)
+    assert second.compile() == compiled
+    assert (second.cache.hits, second.cache.misses) == (4, 0)
+
+
+def test_upstream_change_invalidates_downstream(project_dir, tmp_path):
+    """Test that editing a model recompiles it and everything downstream."""
+    cache_dir = str(tmp_path / "cache")
+    DbtProject(str(project_dir), cache_dir=cache_dir).compile()
+
+    (project_dir / "int_sessions.sql").write_text(
+        "SELECT DISTINCT * FROM {{ ref('stg_events') }}"
+    )
+    project = DbtProject(str(project_dir), cache_dir=cache_dir)
+    project.compile()
+    hits = {name for name, model in project.models.items() if model.cache_hit}
+    assert hits == {"stg_events"}
+    assert project.models["int_sessions"].compiled.startswith("SELECT DISTINCT")
+
+
+def test_schema_prefix_is_part_of_cache_key(project_dir, tmp_path):
+    """Test that changing the schema prefix does not reuse stale SQL."""
+    cache_dir = str(tmp_path / "cache")
+    DbtProject(str(project_dir), cache_dir=cache_dir).compile()
+
+    project = DbtProject(str(project_dir), schema="analytics", cache_dir=cache_dir)
+    compiled = project.compile()
+    assert project.cache.hits == 0
+    assert "FROM analytics.stg_events" in compiled["int_sessions"]
+
+
+def test_vars_are_part_of_cache_key(tmp_path):
+    """Test that changing a var recompiles models that use it."""
+    models = tmp_path / "models"
+    _write_models(models, {"m": "SELECT {{ var('n') }}"})
+    cache_dir = str(tmp_path / "cache")
+    DbtProject(str(models), {"n": "1"}, cache_dir=cache_dir).compile()
+
+    project = DbtProject(str(models), {"n": "2"}, cache_dir=cache_dir)
+    assert project.compile()["m"] == "SELECT 2\n"
+    assert project.cache.hits == 0
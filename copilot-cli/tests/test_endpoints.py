@@ -0,0 +1,212 @@
+"""Tests for load balancing across Ollama endpoints."""
+
+import socket
+import time
+
+import pytest
+
+from copilot_cli.llm import endpoints
+from copilot_cli.llm.endpoints import EndpointPool, NoEndpointAvailable
+
+
+class StubPool(EndpointPool):
+    """Endpoint pool whose /api/tags responses come from a dict."""
+
+    def __init__(self, tags, **kwargs):
+        super().__init__(list(tags), **kwargs)
+        self.tags = tags
+        self.listed = []
+
+    def list_models(self, endpoint):
+        self.listed.append(endpoint.url)
+        models = self.tags[endpoint.url]
+        if isinstance(models, Exception):
+            raise models
+        endpoint.models = set(models)
+        endpoint.refreshed_at = time.monotonic()
+        return [{"name": name} for name in models]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for the endpoints module."""
+    now = [1000.0]
+    monkeypatch.setattr(endpoints.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_from_env_splits_comma_separated_urls(monkeypatch):
+    """Test that OLLAMA_BASE_URL may list several endpoints."""
+    monkeypatch.setenv("OLLAMA_BASE_URL", "http://a:11434, http://b:11434,")
+    pool = EndpointPool.from_env()
+    assert [e.url for e in pool.endpoints] == ["http://a:11434", "http://b:11434"]
+    assert [e.url for e in EndpointPool.from_env("http://c").endpoints] == ["http://c"]
+
+
+def test_acquire_prefers_least_outstanding():
+    """Test least-outstanding-requests balancing."""
+    pool = StubPool({"http://a": ["codellama:7b"], "http://b": ["codellama:7b"]})
+    first = pool.acquire("codellama:7b")
+    second = pool.acquire("codellama:7b")
+    assert {first.url, second.url} == {"http://a", "http://b"}
+
+    pool.release(first)
+    assert pool.acquire("codellama:7b") is first
+
+
+def test_acquire_routes_by_model():
+    """Test that only endpoints with the model receive requests."""
+    pool = StubPool(
+        {"http://a": ["codellama:7b"], "http://b": ["mistral:7b", "llama3:latest"]}
+    )
+    for _ in range(3):
+        assert pool.acquire("mistral:7b").url == "http://b"
+    assert pool.acquire("llama3").url == "http://b"
+    with pytest.raises(NoEndpointAvailable):
+        pool.acquire("phi3")
+
+
+def test_model_lists_are_refreshed_after_interval(clock):
+    """Test that /api/tags is re-read once the refresh interval passes."""
+    pool = StubPool({"http://a": ["m"], "http://b": ["m"]}, refresh_interval=60)
+    pool.release(pool.acquire("m"))
+    pool.release(pool.acquire("m"))
+    assert len(pool.listed) == 2
+
+    clock[0] += 61
+    pool.acquire("m")
+    assert len(pool.listed) == 4
+
+
+def test_unknown_model_list_is_still_a_candidate():
+    """Test that a failed /api/tags does not rule an endpoint out."""
+    pool = StubPool({"http://a": ConnectionError("down"), "http://b": ["other"]})
+    assert pool.acquire("m").url == "http://a"
+
+
+def test_failed_refresh_is_retried_on_next_acquire(clock):
+    """Test that a failed model list refresh is not cached."""
+    tags = {"http://a": ConnectionError("down"), "http://b": ["other"]}
+    pool = StubPool(tags)
+    pool.release(pool.acquire("m"))
+    tags["http://a"] = ["m"]
+    pool.acquire("m")
+    assert pool.listed.count("http://a") == 2
+    assert pool.endpoints[0].models == {"m"}
+
+
+def test_single_endpoint_skips_model_filtering():
+    """Test that a lone endpoint is always used, as a plain client would."""
+    pool = StubPool({"http://a": ["other"]}, eject_after=1)
+    endpoint = pool.acquire("m")
+    assert endpoint.url == "http://a"
+    assert pool.listed == []
+
+    pool.release(endpoint, failed=True)
+    assert endpoint.healthy
+    assert pool.acquire("m") is endpoint
+
+
+def test_repeated_failures_eject_until_readmission(clock):
+    """Test ejection after consecutive failures and readmission after it expires."""
+    pool = StubPool(
+        {"http://a": ["m"], "http://b": ["m"]}, eject_after=2, eject_seconds=30
+    )
+    a, b = pool.endpoints
+    for _ in range(2):
+        pool.acquire("m")
+        pool.release(a, failed=True)
+        a.outstanding = b.outstanding = 0
+    assert not a.healthy
+    assert all(pool.acquire("m") is b for _ in range(3))
+
+    clock[0] += 31
+    assert a.healthy
+    assert pool.acquire("m") is a
+
+    # One more failure after readmission ejects it again
+    pool.release(a, failed=True)
+    assert not a.healthy
+
+
+def test_success_resets_failure_streak():
+    """Test that failures must be consecutive to eject."""
+    pool = StubPool({"http://a": ["m"], "http://b": ["m"]}, eject_after=2)
+    a = pool.endpoints[0]
+    a.outstanding = 3
+    pool.release(a, failed=True)
+    pool.release(a, failed=False)
+    pool.release(a, failed=True)
+    assert a.healthy
+
+
+def test_cancelled_request_does_not_reset_failure_streak():
+    """Test that cancellation neither counts as success nor as failure."""
+    pool = StubPool({"http://a": ["m"], "http://b": ["m"]}, eject_after=2)
+    a = pool.endpoints[0]
+    a.outstanding = 3
+    pool.release(a, failed=True)
+    pool.release(a, failed=None)
+    assert a.failures == 1
+    pool.release(a, failed=True)
+    assert not a.healthy
+    assert a.outstanding == 0
+
+
+def test_all_ejected_probes_earliest_readmission(clock):
+    """Test that a request still goes out when every endpoint is ejected."""
+    pool = StubPool({"http://a": ["m"], "http://b": ["m"]}, eject_after=1)
+    a, b = pool.endpoints
+    pool.refresh_interval = float("inf")
+    pool.release(pool.acquire("m"), failed=True)
+    clock[0] += 5
+    pool.release(pool.acquire("m"), failed=True)
+    assert not a.healthy and not b.healthy
+    assert pool.acquire("m") is a
+
+
+class FakeTagsClient:
+    """Stands in for ``ollama.Client`` and reports a fixed model list."""
+
+    def __init__(self, models):
+        self.models = models
+
+    def list(self):
+        return {"models": [{"name": name} for name in self.models]}
+
+
+@pytest.fixture
+def blackhole():
+    """URL of a server that accepts connections but never responds."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+    yield "http://127.0.0.1:%d" % server.getsockname()[1]
+    server.close()
+
+
+def test_endpoint_reuses_one_client_with_timeout():
+    """Test that each endpoint keeps a single, time-bounded API client."""
+    pool = EndpointPool(["http://a", "http://b"])
+    a, b = pool.endpoints
+    assert a.client is a.client
+    assert a.client is not b.client
+    assert a.client._client.timeout.read == endpoints.LIST_TIMEOUT
+
+
+def test_hanging_refresh_times_out_and_ejects(monkeypatch, blackhole):
+    """Test that an endpoint whose /api/tags never answers is ejected."""
+    monkeypatch.setattr(endpoints, "LIST_TIMEOUT", 0.2)
+    pool = EndpointPool([blackhole, "http://b"], eject_after=2)
+    hung, b = pool.endpoints
+    b.client = FakeTagsClient(["m"])
+
+    started = time.monotonic()
+    first = pool.acquire("m")
+    pool.release(first, failed=None)
+    assert hung.failures == 1 and hung.healthy
+    assert pool.acquire("m") is b
+    assert time.monotonic() - started < 5
+
+    assert not hung.healthy
+    assert hung.models is None
@@ -0,0 +1,160 @@
+"""Tests for deadlines, fallback and hedging in the Ollama client."""
+
+import threading
+import time
+
+import pytest
+
+from copilot_cli.llm import ollama_client
+from copilot_cli.llm.ollama_client import (
+    MIN_HEDGE_SAMPLES,
+    DeadlineExceeded,
+    GenerationCancelled,
+    OllamaClient,
+)
+
+
+class FakeLLM:
+    """Streaming LLM that yields canned chunks, optionally slowly or failing."""
+
+    def __init__(self, chunks=("ok",), delay=0.0, error=None):
+        self.chunks = chunks
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = threading.Event()
+
+    def stream(self, prompt):
+        self.calls += 1
+        completed = False
+        try:
+            for chunk in self.chunks:
+                time.sleep(self.delay)
+                yield chunk
+            if self.error is not None:
+                raise self.error
+            completed = True
+        finally:
+            if not completed and self.error is None:
+                self.cancelled.set()
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    """Build a single-endpoint client whose models are FakeLLMs."""
+    for name in ("OLLAMA_BASE_URL", "OLLAMA_TIMEOUT", "OLLAMA_HEDGE_PERCENTILE"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("OLLAMA_FALLBACK_MODEL", "fallback")
+    monkeypatch.setattr(
+        ollama_client.ollama, "set_host", lambda host: None, raising=False
+    )
+
+    def make(llms, **kwargs):
+        monkeypatch.setattr(
+            OllamaClient, "_create_llm", lambda self, model, base_url: llms[model]
+        )
+        return OllamaClient(model="primary", base_url="http://fake:11434", **kwargs)
+
+    return make
+
+
+def test_generate_joins_stream_and_reports_model(make_client):
+    """Test that chunks are joined and the producing model is reported."""
+    client = make_client(
+        {"primary": FakeLLM(("  SELECT", " 1 \n")), "fallback": FakeLLM()}
+    )
+    info = {}
+    assert client.generate("p", info=info) == "SELECT 1"
+    assert info["model"] == "primary"
+    assert info["generation_seconds"] >= 0
+
+
+def test_deadline_raises_and_cancels_stream(make_client):
+    """Test that a slow generation raises DeadlineExceeded and is closed."""
+    primary = FakeLLM(("x",) * 100, delay=0.02)
+    client = make_client({"primary": primary, "fallback": FakeLLM()}, timeout=0.1)
+    with pytest.raises(DeadlineExceeded):
+        client.generate("p")
+    assert primary.cancelled.wait(5)
+    assert "primary" not in client._latencies
+
+
+def test_cancel_raises_generation_cancelled(make_client):
+    """Test that setting the cancel event stops the generation."""
+    primary = FakeLLM(("x",) * 100, delay=0.02)
+    client = make_client({"primary": primary, "fallback": FakeLLM()})
+    cancel = threading.Event()
+    threading.Timer(0.05, cancel.set).start()
+    with pytest.raises(GenerationCancelled):
+        client.generate("p", cancel=cancel)
+    assert primary.cancelled.wait(5)
+
+
+def test_primary_error_falls_back(make_client):
+    """Test that the fallback model answers when the primary fails."""
+    fallback = FakeLLM(("from fallback",))
+    client = make_client(
+        {
+            "primary": FakeLLM(error=ConnectionError("primary down")),
+            "fallback": fallback,
+        }
+    )
+    info = {}
+    assert client.generate("p", info=info) == "from fallback"
+    assert info["model"] == "fallback"
+    assert fallback.calls == 1
+
+
+def test_both_failing_reraises_fallback_error(make_client):
+    """Test that the fallback's error propagates when both models fail."""
+    client = make_client(
+        {
+            "primary": FakeLLM(error=ConnectionError("primary down")),
+            "fallback": FakeLLM(error=ValueError("fallback down")),
+        }
+    )
+    with pytest.raises(ValueError, match="fallback down"):
+        client.generate("p")
+
+
+def test_hedge_fires_only_after_min_samples(make_client):
+    """Test that hedging waits for enough history, then the fast model wins."""
+    primary = FakeLLM(("slow",) * 10, delay=0.03)
+    fallback = FakeLLM(("fast",))
+    client = make_client(
+        {"primary": primary, "fallback": fallback}, hedge_percentile=50
+    )
+    for _ in range(MIN_HEDGE_SAMPLES - 1):
+        client._record_latency("primary", 0.01)
+
+    # Too few samples: no hedge, however slow the primary is
+    info = {}
+    client.generate("p", info=info)
+    assert info["model"] == "primary"
+    assert fallback.calls == 0
+    assert len(client._latencies["primary"]) == MIN_HEDGE_SAMPLES
+
+    # Enough samples: the primary is past its p50, so the fallback is hedged
+    client.generate("p", info=info)
+    assert info["model"] == "fallback"
+    assert fallback.calls == 1
+    assert primary.cancelled.wait(5)
+
+
+def test_cancelled_loser_is_recorded_as_lower_bound(make_client):
+    """Test that a hedged-out primary still contributes a latency sample."""
+    primary = FakeLLM(("slow",) * 50, delay=0.02)
+    client = make_client(
+        {"primary": primary, "fallback": FakeLLM(("fast",), delay=0.1)},
+        hedge_percentile=50,
+    )
+    for _ in range(MIN_HEDGE_SAMPLES):
+        client._record_latency("primary", 0.05)
+
+    info = {}
+    client.generate("p", info=info)
+    assert info["model"] == "fallback"
+    assert len(client._latencies["primary"]) == MIN_HEDGE_SAMPLES + 1
+    # The primary ran for the hedge delay plus the fallback's generation
+    assert client._latencies["primary"][-1] >= 0.15
+    assert primary.cancelled.wait(5)
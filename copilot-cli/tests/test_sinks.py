@@ -0,0 +1,119 @@
+"""Tests for streaming NDJSON records and response files."""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from copilot_cli.cli.main import _print_result, console
+from copilot_cli.llm.analysis import AnalysisResult
+from copilot_cli.utils import sinks
+from copilot_cli.utils.sinks import ResultSink
+
+
+def _result(path, response="## Summary\nok", error=None):
+    """Build a completed sql_optimization result."""
+    return AnalysisResult(
+        path, "sql_optimization", response=None if error else response, error=error
+    )
+
+
+def test_stdout_stays_pure_ndjson(capsys, tmp_path):
+    """Test that records own stdout while console output goes to stderr."""
+    with ResultSink("batch", "-", save_dir=str(tmp_path / "out")) as sink:
+        console.print("[green]Analyzing 2 files[/green]")
+        for result in (_result("a.sql"), _result("b.sql", error=ValueError("boom"))):
+            sink.emit(result)
+            _print_result(result, "ndjson")
+    out, err = capsys.readouterr()
+
+    records = [json.loads(line) for line in out.splitlines()]
+    assert [(r["path"], r["status"]) for r in records] == [
+        ("a.sql", "ok"),
+        ("b.sql", "error"),
+    ]
+    assert records[0]["sections"] == {"summary": "ok"}
+    assert records[1]["error"] == "boom"
+    assert "Analyzing 2 files" in err
+    assert "Failed b.sql: boom" in err
+    # The background writer's messages are redirected too
+    assert "Saved file" in err
+
+    console.print("after")
+    assert capsys.readouterr().out == "after\n"
+
+
+def test_output_file_appends_records(tmp_path, capsys):
+    """Test that --output-file appends and leaves stdout to the console."""
+    output = tmp_path / "records" / "run.ndjson"
+    for name in ("a.sql", "b.sql"):
+        with ResultSink("watch", str(output)) as sink:
+            sink.emit(_result(name))
+            console.print("still on stdout")
+    assert [json.loads(line)["path"] for line in output.read_text().splitlines()] == [
+        "a.sql",
+        "b.sql",
+    ]
+    assert capsys.readouterr().out.count("still on stdout") == 2
+
+
+@pytest.mark.parametrize("root", [None, "project"])
+@pytest.mark.parametrize(
+    "artifact",
+    [
+        "/etc/passwd",
+        "../outside.sql",
+        "models/../../outside.sql",
+        "project/../../outside.sql",
+        "project/models/../../../outside.sql",
+    ],
+)
+def test_artifact_path_never_escapes_save_dir(tmp_path, monkeypatch, root, artifact):
+    """Test that absolute and ``..`` artifact paths stay under save_dir."""
+    monkeypatch.chdir(tmp_path)
+    save_dir = (tmp_path / "out").resolve()
+    sink = ResultSink("batch", save_dir=str(save_dir), root=root)
+    path = Path(sink.artifact_path(_result(artifact))).resolve()
+    assert save_dir in path.parents
+    assert path.name.endswith(".sql_optimization.md")
+
+
+def test_artifact_path_keeps_layout_under_root(tmp_path):
+    """Test that artifacts under root keep their relative directories."""
+    root = tmp_path / "project"
+    sink = ResultSink("batch", save_dir=str(tmp_path / "out"), root=str(root))
+    path = sink.artifact_path(_result(str(root / "models" / "m.sql")))
+    assert path == str(tmp_path / "out" / "models" / "m.sql.sql_optimization.md")
+
+
+def test_artifact_path_requires_save_dir():
+    """Test that a sink without save_dir refuses to build file paths."""
+    with pytest.raises(ValueError):
+        ResultSink("batch").artifact_path(_result("a.sql"))
+
+
+def test_close_drains_queued_files(tmp_path, monkeypatch):
+    """Test that close() waits for every queued response file."""
+    written = []
+
+    def slow_save(content, file_path):
+        time.sleep(0.01)
+        written.append(file_path)
+        Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(file_path).write_text(content)
+
+    monkeypatch.setattr(sinks, "save_file", slow_save)
+    save_dir = tmp_path / "out"
+    sink = ResultSink("batch", save_dir=str(save_dir), max_pending=2)
+    with sink:
+        for i in range(20):
+            sink.emit(_result(f"m{i}.sql"))
+        # emit() only blocks on a full queue, so writes are still pending
+        assert len(written) < 20
+
+    assert len(written) == 20
+    assert len(os.listdir(save_dir)) == 20
+    assert sink.emitted == 20
+    assert sink.failed_writes == 0
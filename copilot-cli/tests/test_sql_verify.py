@@ -0,0 +1,110 @@
+"""Tests for SQL rewrite verification."""
+
+import sqlite3
+
+import pytest
+
+from copilot_cli.data.sql_verify import (
+    extract_optimized_query,
+    is_ordered,
+    verify_rewrite,
+)
+
+
+@pytest.fixture
+def conn():
+    """Create a small events table whose group order differs from sum order."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE events (customer_id TEXT, amount REAL)")
+    conn.executemany(
+        "INSERT INTO events VALUES (?, ?)",
+        [("a", 1.0), ("b", 5.0), ("b", 5.0), ("c", 3.0), ("c", 1.0)],
+    )
+    return conn
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT customer_id FROM events ORDER BY customer_id",
+        "SELECT customer_id, SUM(amount) FROM events "
+        "GROUP BY customer_id ORDER BY SUM(amount) DESC",
+        "SELECT COUNT(*) FROM events GROUP BY customer_id ORDER BY COUNT(*)",
+        "SELECT customer_id FROM events order\n  by 1 LIMIT 2;",
+        "SELECT 1 UNION SELECT 2 ORDER BY 1",
+    ],
+)
+def test_is_ordered_detects_top_level_order_by(sql):
+    """Test that a final ORDER BY is found, including ones with parentheses."""
+    assert is_ordered(sql)
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT customer_id FROM events",
+        "SELECT * FROM (SELECT * FROM events ORDER BY amount)",
+        "WITH e AS (SELECT * FROM events ORDER BY amount) SELECT * FROM e",
+        "SELECT ROW_NUMBER() OVER (PARTITION BY customer_id ORDER BY amount) "
+        "FROM events",
+        "SELECT 'order by' FROM events -- order by amount",
+    ],
+)
+def test_is_ordered_ignores_nested_order_by(sql):
+    """Test that ORDER BY in subqueries, windows, strings and comments is ignored."""
+    assert not is_ordered(sql)
+
+
+def test_verify_rewrite_accepts_equivalent_rewrite(conn):
+    """Test that a rewrite with the same ordered rows is equivalent."""
+    original = (
+        "SELECT customer_id, SUM(amount) AS total FROM events "
+        "GROUP BY customer_id ORDER BY SUM(amount) DESC"
+    )
+    optimized = (
+        "SELECT customer_id, SUM(amount) AS total FROM events "
+        "GROUP BY 1 ORDER BY total DESC;"
+    )
+    report = verify_rewrite(conn, original, optimized, runs=1)
+    assert report["equivalent"]
+    assert report["order_sensitive"]
+
+
+def test_verify_rewrite_rejects_dropped_order_by(conn):
+    """Test that dropping an ORDER BY with a function call is not a pass."""
+    original = (
+        "SELECT customer_id, SUM(amount) FROM events "
+        "GROUP BY customer_id ORDER BY SUM(amount) DESC"
+    )
+    optimized = "SELECT customer_id, SUM(amount) FROM events GROUP BY customer_id"
+    report = verify_rewrite(conn, original, optimized, runs=1)
+    assert report["order_sensitive"]
+    assert report["same_rows_any_order"]
+    assert not report["equivalent"]
+
+
+def test_verify_rewrite_ignores_order_for_unordered_queries(conn):
+    """Test that row order does not matter when the original is unordered."""
+    original = "SELECT customer_id, amount FROM events"
+    optimized = "SELECT customer_id, amount FROM events ORDER BY amount"
+    report = verify_rewrite(conn, original, optimized, runs=1)
+    assert report["equivalent"]
+    assert not report["order_sensitive"]
+
+
+def test_verify_rewrite_reports_errors(conn):
+    """Test that a failing rewrite is reported and not equivalent."""
+    report = verify_rewrite(conn, "SELECT 1", "SELECT * FROM missing", runs=1)
+    assert "optimized" in report["errors"]
+    assert not report["equivalent"]
+
+
+def test_extract_optimized_query_reads_fenced_section():
+    """Test extraction of the SQL block under ## Optimized Query."""
+    response = (
+        "## Performance Analysis\n```sql\nSELECT * FROM old\n```\n"
+        "## Optimized Query\n```sql\nSELECT id FROM new\n```\n"
+        "## Index Recommendations\nnone\n"
+    )
+    assert extract_optimized_query(response) == "SELECT id FROM new"
+    assert extract_optimized_query("SELECT 1;\n") == "SELECT 1;"
@@ -0,0 +1,129 @@
+"""Tests for schema-driven synthetic data generation."""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from jsonschema import Draft7Validator, FormatChecker
+
+from copilot_cli.data.synthetic import (
+    RNG_BLOCK,
+    generate_rows,
+    load_tables,
+    table_name_for,
+    write_table,
+)
+
+SCHEMA_DIR = Path(__file__).parent.parent / "data_pipeline" / "schemas"
+SCHEMA_PATHS = {
+    table_name_for(str(path)): str(path) for path in sorted(SCHEMA_DIR.glob("*.json"))
+}
+ROW_COUNTS = {"crm_export": 50, "customer_events": 400}
+
+
+def _read_ndjson(path):
+    """Read an NDJSON file into a list of records."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def _format_checker():
+    """FormatChecker that also checks date-time without optional extras."""
+    checker = FormatChecker()
+    checker.checks("date-time", raises=ValueError)(
+        lambda value: datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+    )
+    return checker
+
+
+@pytest.fixture
+def tables():
+    """Table specs for the pipeline's JSON Schemas."""
+    return load_tables(SCHEMA_PATHS)
+
+
+@pytest.fixture
+def generated(tables, tmp_path):
+    """Generate every table as NDJSON and return the records by table."""
+    records = {}
+    for name, table in tables.items():
+        path = tmp_path / f"{name}.ndjson"
+        write_table(
+            table,
+            ROW_COUNTS[name],
+            str(path),
+            fmt="ndjson",
+            row_counts=ROW_COUNTS,
+            chunk_size=64,
+            workers=2,
+        )
+        records[name] = _read_ndjson(path)
+    return records
+
+
+def test_customer_id_references_crm_export(tables):
+    """Test that customer_events.customer_id is resolved as a foreign key."""
+    assert tables["crm_export"].primary_key == "customer_id"
+    assert tables["customer_events"].primary_key == "event_id"
+    assert tables["customer_events"].column("customer_id").references == "crm_export"
+
+
+def test_rows_validate_against_their_schema(generated):
+    """Test that every generated row is valid, including string formats."""
+    checker = _format_checker()
+    for name, records in generated.items():
+        schema = json.loads(Path(SCHEMA_PATHS[name]).read_text())
+        validator = Draft7Validator(schema, format_checker=checker)
+        assert len(records) == ROW_COUNTS[name]
+        for record in records:
+            errors = [e.message for e in validator.iter_errors(record)]
+            assert errors == [], (name, record)
+
+
+def test_foreign_keys_have_no_orphans(generated):
+    """Test that every event's customer_id exists in crm_export."""
+    customers = [r["customer_id"] for r in generated["crm_export"]]
+    assert len(set(customers)) == len(customers)
+    referenced = {r["customer_id"] for r in generated["customer_events"]}
+    assert referenced <= set(customers)
+    # Keys are drawn from the whole parent table, not just a few rows
+    assert len(referenced) > ROW_COUNTS["crm_export"] // 2
+
+
+@pytest.mark.parametrize("fmt", ["csv", "ndjson"])
+def test_output_independent_of_workers_and_chunk_size(tables, tmp_path, fmt):
+    """Test that chunking and worker count never change the bytes written."""
+    table = tables["customer_events"]
+    outputs = []
+    for workers, chunk_size in [(1, 1000), (3, 64), (2, 7)]:
+        path = tmp_path / f"{workers}_{chunk_size}.{fmt}"
+        write_table(
+            table,
+            300,
+            str(path),
+            fmt=fmt,
+            row_counts=ROW_COUNTS,
+            chunk_size=chunk_size,
+            workers=workers,
+        )
+        outputs.append(path.read_bytes())
+    assert outputs[0] == outputs[1] == outputs[2]
+
+    reseeded = tmp_path / f"reseeded.{fmt}"
+    write_table(table, 300, str(reseeded), fmt=fmt, seed=7, row_counts=ROW_COUNTS)
+    assert reseeded.read_bytes() != outputs[0]
+
+
+def test_rows_do_not_depend_on_chunk_boundaries(tables):
+    """Test that chunks straddling random blocks match one large chunk."""
+    table = tables["crm_export"]
+    rows = 2 * RNG_BLOCK + 100
+    whole = list(generate_rows(table, rows, row_counts=ROW_COUNTS))
+    bounds = [0, 1, RNG_BLOCK - 3, RNG_BLOCK + 5, rows]
+    chunked = [
+        row
+        for start, end in zip(bounds, bounds[1:])
+        for row in generate_rows(table, end - start, row_counts=ROW_COUNTS, start=start)
+    ]
+    assert chunked == whole
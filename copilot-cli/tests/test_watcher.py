@@ -0,0 +1,169 @@
+"""Tests for debounced directory watching and watch-mode sessions."""
+
+import time
+
+import pytest
+
+from copilot_cli.llm.analysis import WatchSession
+from copilot_cli.llm.ollama_client import GenerationCancelled
+from copilot_cli.utils.watcher import WATCHDOG_AVAILABLE, DirectoryWatcher
+
+BACKENDS = [
+    True,
+    pytest.param(
+        False,
+        marks=pytest.mark.skipif(not WATCHDOG_AVAILABLE, reason="needs watchdog"),
+    ),
+]
+
+
+def _wait_until(predicate, timeout=5.0):
+    """Poll until ``predicate`` holds or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert predicate()
+
+
+class FakeClient:
+    """Stand-in for OllamaClient that answers with the submitted artifact.
+
+    Generations for artifacts listed in ``block`` wait until they are
+    cancelled, as a real streaming generation would.
+    """
+
+    model = "fake:7b"
+
+    def __init__(self, block=()):
+        self.block = set(block)
+        self.started = []
+        self.cancelled = []
+
+    def generate_from_template(
+        self, template, model=None, cancel=None, deadline=None, info=None, **fields
+    ):
+        (content,) = fields.values()
+        self.started.append(content)
+        if content in self.block:
+            assert cancel.wait(5)
+            self.cancelled.append(content)
+            raise GenerationCancelled("cancelled")
+        return f"## Result\n{content}"
+
+
+@pytest.fixture
+def watch(tmp_path):
+    """Start a watcher on tmp_path and collect the paths it reports."""
+    watchers = []
+    reported = []
+
+    def start(use_polling=True, **kwargs):
+        watcher = DirectoryWatcher(
+            str(tmp_path),
+            reported.append,
+            extensions=[".sql"],
+            debounce=0.3,
+            poll_interval=0.05,
+            use_polling=use_polling,
+            **kwargs,
+        )
+        watcher.start()
+        watchers.append(watcher)
+        # Let the first snapshot / observer settle before touching files
+        time.sleep(0.2)
+        return watcher
+
+    yield start, reported
+    for watcher in watchers:
+        watcher.stop()
+
+
+@pytest.mark.parametrize("use_polling", BACKENDS)
+def test_rapid_saves_produce_one_callback(watch, tmp_path, use_polling):
+    """Test that a burst of saves is debounced into a single callback."""
+    start, reported = watch
+    start(use_polling=use_polling)
+    model = tmp_path / "model.sql"
+    for i in range(5):
+        model.write_text(f"SELECT {i}")
+        time.sleep(0.08)
+
+    _wait_until(lambda: reported)
+    time.sleep(0.5)
+    assert reported == [str(model)]
+
+
+@pytest.mark.parametrize("use_polling", BACKENDS)
+def test_hidden_virtualenv_and_excluded_paths_are_skipped(watch, tmp_path, use_polling):
+    """Test that .git, .venv, caches and excluded outputs never trigger."""
+    ignored = [
+        tmp_path / ".git" / "x.sql",
+        tmp_path / ".venv" / "lib" / "x.sql",
+        tmp_path / ".copilot_cache" / "x.sql",
+        tmp_path / "__pycache__" / "x.sql",
+        tmp_path / "venv" / "x.sql",
+        tmp_path / "out" / "x.sql",
+        tmp_path / ".x.sql",
+    ]
+    for path in ignored:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    start, reported = watch
+    start(use_polling=use_polling, exclude=[str(tmp_path / "out")])
+
+    for path in ignored:
+        path.write_text("SELECT 1")
+    (tmp_path / "models").mkdir()
+    (tmp_path / "models" / "m.sql").write_text("SELECT 1")
+
+    _wait_until(lambda: reported)
+    time.sleep(0.5)
+    assert reported == [str(tmp_path / "models" / "m.sql")]
+
+
+def test_newer_save_cancels_in_flight_run(tmp_path):
+    """Test that a superseded generation is cancelled and never reported."""
+    model = tmp_path / "model.sql"
+    model.write_text("SELECT 1")
+    client = FakeClient(block={"SELECT 1"})
+    results = []
+    session = WatchSession(client, results.append, workers=2)
+
+    session.submit(str(model))
+    _wait_until(lambda: client.started)
+    model.write_text("SELECT 2")
+    session.submit(str(model))
+    _wait_until(lambda: results and client.cancelled)
+    session.close()
+
+    assert client.cancelled == ["SELECT 1"]
+    assert [r.response for r in results] == ["## Result\nSELECT 2"]
+    assert results[0].model == "fake:7b"
+
+
+def test_watcher_drives_session_end_to_end(tmp_path):
+    """Test that rapid saves through a watcher produce one analysis."""
+    client = FakeClient()
+    results = []
+    session = WatchSession(client, results.append)
+    watcher = DirectoryWatcher(
+        str(tmp_path),
+        session.submit,
+        debounce=0.3,
+        poll_interval=0.05,
+        use_polling=True,
+    )
+    watcher.start()
+    try:
+        time.sleep(0.2)
+        model = tmp_path / "model.sql"
+        for i in range(4):
+            model.write_text(f"SELECT {i}")
+            time.sleep(0.08)
+        _wait_until(lambda: results)
+        time.sleep(0.5)
+    finally:
+        watcher.stop()
+        session.close()
+
+    assert len(client.started) == 1
+    assert [r.response for r in results] == ["## Result\nSELECT 3"]